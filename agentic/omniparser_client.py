@@ -8,6 +8,7 @@ import os
 import re
 import time
 import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from typing import List, Optional
 
 import httpx
@@ -381,7 +382,7 @@ class OmniParserClient:
 
 # Singleton instance
 _client_instance: Optional[OmniParserClient] = None
-_warmup_thread: Optional[threading.Thread] = None
+_warmup_future: Optional[Future] = None
 
 
 def get_omniparser_client() -> OmniParserClient:
@@ -392,15 +393,21 @@ def get_omniparser_client() -> OmniParserClient:
     return _client_instance
 
 
-def start_warmup_async() -> threading.Thread:
+def start_warmup_async() -> Future:
     """
     Start OmniParser warmup in a background thread.
     Call this at the beginning of a flow to pre-heat the API.
+    If a warmup is already in flight, its future is returned instead.
 
     Returns:
-        The warmup thread (can be joined later if needed)
+        Future resolved when warmup finishes (never raises; failures are logged)
     """
-    global _warmup_thread
+    global _warmup_future
+
+    if _warmup_future is not None and not _warmup_future.done():
+        return _warmup_future
+
+    future: Future = Future()
 
     def _do_warmup():
         try:
@@ -419,16 +426,19 @@ def start_warmup_async() -> threading.Thread:
             )
         except Exception as e:
             logger.warning(f"[OMNIPARSER] Warmup failed (non-critical): {e}")
+        finally:
+            future.set_result(None)
 
-    _warmup_thread = threading.Thread(target=_do_warmup, daemon=True)
-    _warmup_thread.start()
+    # Daemon thread so a slow warmup never blocks process exit
+    _warmup_future = future
+    threading.Thread(target=_do_warmup, daemon=True).start()
     logger.info("[OMNIPARSER] Warmup started in background")
-    return _warmup_thread
+    return future
 
 
 def wait_for_warmup(timeout: float = 60.0) -> bool:
     """
-    Wait for the warmup thread to complete.
+    Wait for the warmup to complete.
 
     Args:
         timeout: Maximum seconds to wait
@@ -436,18 +446,16 @@ def wait_for_warmup(timeout: float = 60.0) -> bool:
     Returns:
         True if warmup completed, False if timed out or no warmup running
     """
-    global _warmup_thread
-
-    if _warmup_thread is None:
+    if _warmup_future is None:
         return True  # No warmup to wait for
 
-    if not _warmup_thread.is_alive():
+    if _warmup_future.done():
         return True  # Already finished
 
     logger.info(f"[OMNIPARSER] Waiting for warmup to complete (max {timeout}s)...")
-    _warmup_thread.join(timeout=timeout)
-
-    if _warmup_thread.is_alive():
+    try:
+        _warmup_future.result(timeout=timeout)
+    except FutureTimeoutError:
         logger.warning("[OMNIPARSER] Warmup still running after timeout")
         return False
 
@@ -52,6 +52,10 @@ class Config:
         except Exception:
             RPA_CONFIG = {}
 
+    # Cached by get_screen_resolution / get_available_resolutions
+    _screen_resolution = None
+    _available_resolutions = None
+
     @staticmethod
     def get_app_dir() -> Path:
         """Get application directory based on OS"""
@@ -133,17 +137,27 @@ class Config:
 
     @staticmethod
     def get_screen_resolution():
-        """Get configured screen resolution or default"""
+        """
+        Get configured screen resolution or default.
+        The persisted value is read once and cached; set_screen_resolution
+        keeps the cache in sync.
+        """
+        if Config._screen_resolution is not None:
+            return Config._screen_resolution
+
         # Try to get from persisted config first (saved by user in GUI)
         from config_manager import ConfigManager
 
         cm = ConfigManager()
         saved_config = cm.load_config()
         if saved_config and "screen_resolution" in saved_config:
-            return saved_config["screen_resolution"]
+            resolution = saved_config["screen_resolution"]
+        else:
+            # Otherwise use default from rpa_config.json
+            resolution = Config.RPA_CONFIG.get("screen_resolution", "1366x768")
 
-        # Otherwise use default from rpa_config.json
-        return Config.RPA_CONFIG.get("screen_resolution", "1366x768")
+        Config._screen_resolution = resolution
+        return resolution
 
     @staticmethod
     def set_screen_resolution(resolution: str):
@@ -153,12 +167,19 @@ class Config:
         cm = ConfigManager()
         config_data = cm.load_config() or {}
         config_data["screen_resolution"] = resolution
-        return cm.save_config(config_data)
+        saved = cm.save_config(config_data)
+        if saved:
+            Config._screen_resolution = resolution
+        return saved
 
     @staticmethod
     def get_available_resolutions():
-        """Get list of available screen resolutions"""
-        return Config.RPA_CONFIG.get("available_resolutions", ["1366x768"])
+        """Get list of available screen resolutions (cached after first call)"""
+        if Config._available_resolutions is None:
+            Config._available_resolutions = list(
+                Config.RPA_CONFIG.get("available_resolutions", ["1366x768"])
+            )
+        return Config._available_resolutions
 
     @staticmethod
     def get_hospitals():
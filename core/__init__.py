@@ -8,6 +8,7 @@ from .system_utils import (
     allow_system_sleep,
     send_key_windows,
     send_text_windows,
+    send_key_batch,
     INPUT,
     KEYBDINPUT,
     VK_TAB,
@@ -20,6 +21,8 @@ from .system_utils import (
     VK_UP,
     VK_DOWN,
     VK_F5,
+    VK_A,
+    VK_C,
 )
 from .vdi_input import type_with_clipboard, press_key_vdi, type_via_alt_codes
 from .s3_client import S3Client
@@ -33,6 +36,7 @@ __all__ = [
     "allow_system_sleep",
     "send_key_windows",
     "send_text_windows",
+    "send_key_batch",
     "type_with_clipboard",
     "press_key_vdi",
     "type_via_alt_codes",
@@ -0,0 +1,83 @@
+"""
+Direct Win32 clipboard access.
+Clears and reads the clipboard with a single open/close cycle per call,
+avoiding pyperclip's extra round trips. Falls back to pyperclip off Windows.
+"""
+
+import platform
+import time
+
+import pyperclip
+
+if platform.system() == "Windows":
+    import ctypes
+    from ctypes import wintypes
+
+    CF_UNICODETEXT = 13
+
+    _user32 = ctypes.windll.user32
+    _kernel32 = ctypes.windll.kernel32
+
+    _user32.OpenClipboard.argtypes = [wintypes.HWND]
+    _user32.OpenClipboard.restype = wintypes.BOOL
+    _user32.CloseClipboard.restype = wintypes.BOOL
+    _user32.EmptyClipboard.restype = wintypes.BOOL
+    _user32.GetClipboardData.argtypes = [wintypes.UINT]
+    _user32.GetClipboardData.restype = wintypes.HANDLE
+    _kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+    _kernel32.GlobalLock.restype = wintypes.LPVOID
+    _kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+    _kernel32.GlobalUnlock.restype = wintypes.BOOL
+
+
+def _open_clipboard(retries=10, delay_s=0.01):
+    """Open the clipboard, retrying briefly if another process holds it."""
+    for _ in range(retries):
+        if _user32.OpenClipboard(None):
+            return True
+        time.sleep(delay_s)
+    return False
+
+
+def clear():
+    """
+    Empty the clipboard.
+    EmptyClipboard is synchronous, so no settle delay is needed afterwards.
+    """
+    if platform.system() != "Windows":
+        pyperclip.copy("")
+        return
+
+    if not _open_clipboard():
+        raise Exception("Could not open clipboard")
+    try:
+        _user32.EmptyClipboard()
+    finally:
+        _user32.CloseClipboard()
+
+
+def read_text():
+    """
+    Read Unicode text from the clipboard.
+
+    Returns:
+        Clipboard text, or "" if the clipboard holds no text
+    """
+    if platform.system() != "Windows":
+        return pyperclip.paste()
+
+    if not _open_clipboard():
+        raise Exception("Could not open clipboard")
+    try:
+        handle = _user32.GetClipboardData(CF_UNICODETEXT)
+        if not handle:
+            return ""
+        pointer = _kernel32.GlobalLock(handle)
+        if not pointer:
+            return ""
+        try:
+            return ctypes.wstring_at(pointer)
+        finally:
+            _kernel32.GlobalUnlock(handle)
+    finally:
+        _user32.CloseClipboard()
@@ -0,0 +1,117 @@
+"""
+Background delivery of end-of-run webhook notifications.
+Notifications are not on the critical path of a flow, so they are queued and
+sent in order by a single daemon worker, letting the next flow start while n8n
+is still responding. Webhook posts are not idempotent: a notification is only
+retried when the connection could not be opened, and a full queue fails the
+notification instead of blocking the flow.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from logger import logger
+
+MAX_PENDING = 32
+DEFAULT_RETRIES = 3
+BACKOFF_BASE_S = 1.0
+
+_queue: queue.Queue = queue.Queue(maxsize=MAX_PENDING)
+_worker: threading.Thread | None = None
+_worker_lock = threading.Lock()
+
+
+def _request_not_sent(error: Exception) -> bool:
+    """True if the request failed before any of it reached the server."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        reason = getattr(error.args[0], "reason", error.args[0])
+        return isinstance(reason, NewConnectionError)
+    return False
+
+
+def _deliver(send, payload, retries):
+    """
+    Send a payload, retrying with exponential backoff only while the
+    connection cannot be opened (so n8n never receives a payload twice).
+
+    Returns:
+        The response received, whatever its status code
+    """
+    attempt = 0
+    while True:
+        try:
+            return send(payload)
+        except Exception as e:
+            if attempt >= retries or not _request_not_sent(e):
+                raise
+            logger.warning(
+                f"[NOTIFY] Webhook unreachable (attempt {attempt + 1}/{retries + 1}): {e}"
+            )
+        time.sleep(BACKOFF_BASE_S * (2**attempt))
+        attempt += 1
+
+
+def _run_worker():
+    """Drain the queue forever, delivering notifications in submission order."""
+    while True:
+        send, payload, retries, future = _queue.get()
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(_deliver(send, payload, retries))
+                except Exception as e:
+                    logger.error(f"[NOTIFY] Webhook delivery failed: {e}")
+                    future.set_exception(e)
+        finally:
+            _queue.task_done()
+
+
+def _ensure_worker():
+    """Start the daemon worker on first use."""
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(
+                target=_run_worker, name="notification-worker", daemon=True
+            )
+            _worker.start()
+
+
+def submit(send, payload, retries=DEFAULT_RETRIES) -> Future:
+    """
+    Queue a notification for background delivery.
+
+    Args:
+        send: Callable that posts the payload and returns a requests.Response
+        payload: JSON-serializable payload passed to send
+        retries: Extra attempts while the webhook cannot be reached
+
+    Returns:
+        Future resolving to the response, or failed with queue.Full if too
+        many notifications are already pending
+    """
+    _ensure_worker()
+    future = Future()
+    try:
+        _queue.put_nowait((send, payload, retries, future))
+    except queue.Full as e:
+        # Never block the flow: make a stuck webhook visible and drop this one
+        logger.error(
+            f"[NOTIFY] Notification queue full ({MAX_PENDING} pending), "
+            "dropping notification"
+        )
+        future.set_running_or_notify_cancel()
+        future.set_exception(e)
+    return future
+
+
+def pending() -> int:
+    """Number of notifications waiting to be sent."""
+    return _queue.qsize()
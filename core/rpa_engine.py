@@ -8,7 +8,7 @@ import threading
 import pyautogui
 
 from config import config
-
+from .template_cache import get_template
 
 # --- Global State ---
 rpa_should_stop = False
@@ -149,6 +149,21 @@ def stoppable_sleep(duration_s, check_interval_s=0.1):
         time.sleep(sleep_for)
 
 
+def adaptive_poll_interval(elapsed_s, max_interval_s=0.5):
+    """
+    Polling delay that starts fast and backs off the longer a wait runs.
+    Elements that paint quickly are detected within ~50ms, while long waits
+    settle at max_interval_s so they don't burn CPU on template matching.
+    """
+    if elapsed_s < 0.5:
+        interval = 0.05
+    elif elapsed_s < 2.0:
+        interval = 0.2
+    else:
+        interval = max_interval_s
+    return min(interval, max_interval_s)
+
+
 class RPABotBase:
     """
     Base class for RPA bots providing common utilities.
@@ -187,14 +202,21 @@ class RPABotBase:
         check_interval=0.5,
         description="element",
         auto_click=False,
+        region=None,
     ):
-        """Wait until an element appears on screen."""
+        """
+        Wait until an element appears on screen.
+        image_path may be a path or an already-decoded template (numpy array).
+        Pass region=(left, top, width, height) to restrict the search area.
+        Polling starts at 50ms and backs off up to check_interval.
+        """
         if timeout is None:
             timeout = config.get_timeout("default")
         if confidence is None:
             confidence = self.confidence
 
         print(f"[WAIT] Waiting for {description} (timeout: {timeout}s)")
+        template = get_template(image_path)
         start_time = time.time()
         attempts = 0
 
@@ -202,14 +224,18 @@ class RPABotBase:
             self.check_stop()
 
             try:
-                location = pyautogui.locateOnScreen(image_path, confidence=confidence)
+                location = pyautogui.locateOnScreen(
+                    template, confidence=confidence, region=region
+                )
                 if location:
                     elapsed = round(time.time() - start_time, 1)
                     print(f"[WAIT] {description} found after {elapsed}s")
                     self.stoppable_sleep(1)
                     try:
                         confirmed_location = (
-                            pyautogui.locateOnScreen(image_path, confidence=confidence)
+                            pyautogui.locateOnScreen(
+                                template, confidence=confidence, region=region
+                            )
                             or location
                         )
                     except Exception:
@@ -224,7 +250,7 @@ class RPABotBase:
                 print(f"[WAIT] Error: {str(e)}")
 
             attempts += 1
-            time.sleep(check_interval)
+            time.sleep(adaptive_poll_interval(time.time() - start_time, check_interval))
 
         print(f"[WAIT] Timeout: {description} not found")
         return None
@@ -238,6 +264,7 @@ class RPABotBase:
         confidence=None,
         check_interval=0.5,
         auto_click=False,
+        region=None,
     ):
         """
         Wait for a target element, handling obstacles through handlers.
@@ -247,6 +274,7 @@ class RPABotBase:
             target_description: Description of the target (for logs)
             handlers: Map of obstacles -> (description, handler_function)
             timeout: Maximum total wait time
+            region: Optional (left, top, width, height) to restrict the target search
 
         Returns:
             Location of target element, or None if failed
@@ -257,6 +285,7 @@ class RPABotBase:
             confidence = self.confidence
 
         print(f"[WAIT-R] Waiting for {target_description} (handling obstacles)")
+        template = get_template(target_image_path)
         start_time = time.time()
 
         while (time.time() - start_time) < timeout:
@@ -264,7 +293,7 @@ class RPABotBase:
             try:
                 # Search for the primary target
                 location = pyautogui.locateOnScreen(
-                    target_image_path, confidence=confidence
+                    template, confidence=confidence, region=region
                 )
                 if location:
                     elapsed = round(time.time() - start_time, 1)
@@ -275,7 +304,7 @@ class RPABotBase:
                     try:
                         confirmed_location = (
                             pyautogui.locateOnScreen(
-                                target_image_path, confidence=confidence
+                                template, confidence=confidence, region=region
                             )
                             or location
                         )
@@ -295,7 +324,7 @@ class RPABotBase:
             for obstacle_image, (obs_desc, handler_func) in handlers.items():
                 try:
                     obstacle_loc = pyautogui.locateOnScreen(
-                        obstacle_image, confidence=confidence
+                        get_template(obstacle_image), confidence=confidence
                     )
                     if obstacle_loc:
                         print(f"\n[HANDLER] Obstacle detected: {obs_desc}")
@@ -327,13 +356,14 @@ class RPABotBase:
             confidence = self.confidence
 
         print(f"[WAIT] Waiting for {description} to disappear")
+        template = get_template(image_path)
         start_time = time.time()
 
         while (time.time() - start_time) < timeout:
             self.check_stop()
 
             try:
-                location = pyautogui.locateOnScreen(image_path, confidence=confidence)
+                location = pyautogui.locateOnScreen(template, confidence=confidence)
                 if not location:
                     elapsed = round(time.time() - start_time, 1)
                     print(f"[WAIT] {description} disappeared after {elapsed}s")
@@ -28,6 +28,8 @@ if platform.system() == "Windows":
     VK_UP = 0x26
     VK_DOWN = 0x28
     VK_F5 = 0x74
+    VK_A = 0x41
+    VK_C = 0x43
 
     # Define Windows structures
     class KEYBDINPUT(ctypes.Structure):
@@ -39,13 +41,39 @@ if platform.system() == "Windows":
             ("dwExtraInfo", ctypes.POINTER(wintypes.ULONG)),
         ]
 
+    class MOUSEINPUT(ctypes.Structure):
+        _fields_ = [
+            ("dx", wintypes.LONG),
+            ("dy", wintypes.LONG),
+            ("mouseData", wintypes.DWORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ctypes.POINTER(wintypes.ULONG)),
+        ]
+
+    class HARDWAREINPUT(ctypes.Structure):
+        _fields_ = [
+            ("uMsg", wintypes.DWORD),
+            ("wParamL", wintypes.WORD),
+            ("wParamH", wintypes.WORD),
+        ]
+
     class INPUT(ctypes.Structure):
+        # All members are needed so sizeof(INPUT) matches what SendInput
+        # expects (MOUSEINPUT is the largest); a short struct is rejected
         class _INPUT(ctypes.Union):
-            _fields_ = [("ki", KEYBDINPUT)]
+            _fields_ = [
+                ("ki", KEYBDINPUT),
+                ("mi", MOUSEINPUT),
+                ("hi", HARDWAREINPUT),
+            ]
 
         _anonymous_ = ("_input",)
         _fields_ = [("type", wintypes.DWORD), ("_input", _INPUT)]
 
+    # Separate handle so SendInput failures can be read via get_last_error()
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+
 else:
     # Stub definitions for non-Windows platforms
     INPUT_KEYBOARD = 1
@@ -63,6 +91,8 @@ else:
     VK_UP = 0x26
     VK_DOWN = 0x28
     VK_F5 = 0x74
+    VK_A = 0x41
+    VK_C = 0x43
 
     class KEYBDINPUT:
         pass
@@ -170,3 +200,36 @@ def send_text_windows(text):
     ctypes.windll.user32.SendInput(
         len(inputs_list), ctypes.byref(inputs_array), ctypes.sizeof(INPUT)
     )
+
+
+def send_key_batch(events):
+    """
+    Send a sequence of key events in a single SendInput call.
+    Uses hardware scan codes (like pydirectinput) so it works in VDI.
+
+    Args:
+        events: List of (vk_code, is_keyup) tuples, e.g.
+            [(VK_CONTROL, False), (VK_A, False), (VK_A, True), (VK_CONTROL, True)]
+
+    Raises:
+        OSError: If Windows did not accept every event
+    """
+    if platform.system() != "Windows":
+        raise Exception("send_key_batch only works on Windows")
+
+    inputs_list = []
+    for vk_code, is_keyup in events:
+        scan_code = ctypes.windll.user32.MapVirtualKeyW(vk_code, 0)
+        flags = KEYEVENTF_SCANCODE | (KEYEVENTF_KEYUP if is_keyup else 0)
+        key_input = INPUT()
+        key_input.type = INPUT_KEYBOARD
+        key_input.ki = KEYBDINPUT(0, scan_code, flags, 0, None)
+        inputs_list.append(key_input)
+
+    # Send all inputs at once
+    inputs_array = (INPUT * len(inputs_list))(*inputs_list)
+    sent = _user32.SendInput(
+        len(inputs_list), ctypes.byref(inputs_array), ctypes.sizeof(INPUT)
+    )
+    if sent != len(inputs_list):
+        raise ctypes.WinError(ctypes.get_last_error())
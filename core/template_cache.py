@@ -0,0 +1,43 @@
+"""
+Process-wide cache of decoded image templates.
+Templates are shipped assets that never change at runtime, so each PNG is
+read and decoded once and shared by every flow in the process.
+"""
+
+import functools
+
+import cv2
+
+
+@functools.lru_cache(maxsize=256)
+def load_template(path: str):
+    """
+    Read and decode an image template from disk (cached by path).
+
+    Returns:
+        BGR numpy array, or None if the image could not be read
+    """
+    return cv2.imread(path, cv2.IMREAD_COLOR)
+
+
+def get_template(image):
+    """
+    Resolve an image path to its cached decoded template.
+    Non-path inputs (arrays, PIL images) and unreadable paths are returned as-is,
+    so pyautogui keeps its normal behavior (including its not-found errors).
+    """
+    if isinstance(image, str):
+        template = load_template(image)
+        if template is not None:
+            return template
+    return image
+
+
+def preload_templates(paths):
+    """
+    Decode a set of templates ahead of time (e.g. at flow construction),
+    so the first poll of each wait does not pay the disk read + decode.
+    """
+    for path in paths:
+        if path:
+            load_template(path)
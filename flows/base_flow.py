@@ -3,6 +3,8 @@ Base Flow - Abstract base class for all RPA flows.
 Provides common flow lifecycle and error handling.
 """
 
+import hashlib
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
 
@@ -13,6 +15,7 @@ import requests
 from config import config
 from core.rpa_engine import RPABotBase, rpa_state, set_should_stop
 from core.system_utils import keep_system_awake, allow_system_sleep
+from core.template_cache import get_template
 from core.vdi_input import stoppable_sleep, type_with_clipboard, press_key_vdi
 from logger import logger
 from services.modal_watcher_service import start_modal_watcher, stop_modal_watcher
@@ -44,6 +47,8 @@ class BaseFlow(RPABotBase, ABC):
         self.trigger_type = None
         self.doctor_name = None
         self.credentials = []  # List of CredentialItem objects
+        # Set by execute() when it already sent the completion webhook itself
+        self._completion_notified = False
 
     def setup(
         self,
@@ -133,6 +138,122 @@ class BaseFlow(RPABotBase, ABC):
         """
         pass
 
+    def _wait_until(self, predicate, timeout, initial=0.1, factor=1.5, cap=0.5):
+        """
+        Poll predicate() with an increasing delay until it returns truthy.
+
+        Fast UI transitions are detected within the first short polls, while
+        slow ones back off to at most `cap` seconds between checks.
+
+        Args:
+            predicate: Zero-argument callable, polled until truthy
+            timeout: Maximum total wait in seconds
+            initial: First delay between polls (default: 0.1)
+            factor: Multiplier applied to the delay after each poll (default: 1.5)
+            cap: Maximum delay between polls (default: 0.5)
+
+        Returns:
+            True if predicate became truthy within timeout, False otherwise
+        """
+        deadline = time.monotonic() + timeout
+        delay = initial
+        while True:
+            if predicate():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            stoppable_sleep(min(delay, remaining))
+            delay = min(delay * factor, cap)
+
+    def wait_until_stable(
+        self, region=None, max_wait=2.0, stable_frames=2, interval=0.15
+    ):
+        """
+        Wait until the screen (or a region of it) stops changing.
+
+        Hashes consecutive screenshots and returns as soon as `stable_frames`
+        consecutive frames are identical, or after `max_wait` seconds.
+
+        Args:
+            region: Optional (left, top, width, height); None = full screen
+            max_wait: Maximum wait in seconds (default: 2.0)
+            stable_frames: Identical consecutive frames required (default: 2)
+            interval: Delay between screenshots in seconds (default: 0.15)
+
+        Returns:
+            True if the screen settled, False if max_wait was reached
+        """
+        deadline = time.monotonic() + max_wait
+        last_digest = None
+        matches = 1
+
+        while time.monotonic() < deadline:
+            frame = pyautogui.screenshot(region=region)
+            digest = hashlib.blake2b(frame.tobytes(), digest_size=8).digest()
+            if digest == last_digest:
+                matches += 1
+                if matches >= stable_frames:
+                    return True
+            else:
+                matches = 1
+            last_digest = digest
+            stoppable_sleep(interval)
+
+        return False
+
+    def _check_element_exists(self, image_path, confidence=None, region=None):
+        """Quickly check if an element exists on screen without waiting."""
+        if confidence is None:
+            confidence = self.confidence
+        try:
+            location = pyautogui.locateOnScreen(
+                get_template(image_path), confidence=confidence, region=region
+            )
+            return location is not None
+        except pyautogui.ImageNotFoundException:
+            return False
+        except Exception:
+            return False
+
+    def _get_window_region(self, title: str):
+        """
+        Get the on-screen bounds of the first window whose title contains `title`.
+        Used to restrict template matching to that window instead of the full screen.
+
+        Returns:
+            (left, top, width, height) tuple, or None to fall back to full screen
+        """
+        try:
+            windows = pyautogui.getWindowsWithTitle(title)
+        except Exception:
+            return None
+
+        for window in windows:
+            if window.width > 0 and window.height > 0:
+                screen_w, screen_h = pyautogui.size()
+                left, top = max(window.left, 0), max(window.top, 0)
+                width = min(window.left + window.width, screen_w) - left
+                height = min(window.top + window.height, screen_h) - top
+                if width > 0 and height > 0:
+                    return (left, top, width, height)
+        return None
+
+    def _send_hotkey(self, *keys):
+        """
+        Send a key combination (e.g. "ctrl", "c") via pydirectinput.
+        Modifiers are held, the last key is pressed, then modifiers are released,
+        with no delays in between - SendInput preserves the ordering.
+        """
+        *modifiers, key = keys
+        for modifier in modifiers:
+            pydirectinput.keyDown(modifier)
+        try:
+            pydirectinput.press(key)
+        finally:
+            for modifier in reversed(modifiers):
+                pydirectinput.keyUp(modifier)
+
     # Lobby URL for VDI Desktops
     LOBBY_URL = "https://baptist-health-south-florida.workspaceair.com/catalog-portal/ui#/apps/categories/VDI%2520Desktops"
 
@@ -260,13 +381,15 @@ class BaseFlow(RPABotBase, ABC):
         self.verify_lobby()
 
         try:
+            self._completion_notified = False
             result = self.execute()
 
             # Only notify completion if result doesn't have an error
             # (errors are already notified by notify_error() in execute())
+            # and execute() did not already notify (e.g. alongside cleanup)
             # Note: Baptist returns list of screenshots, summary flows return dict
             has_error = isinstance(result, dict) and result.get("error")
-            if result and not has_error:
+            if result and not has_error and not self._completion_notified:
                 self.notify_completion(result)
 
             print("\n" + "=" * 70)
@@ -593,7 +716,12 @@ class BaseFlow(RPABotBase, ABC):
 
     def _send_to_summary_webhook_n8n(self, data):
         """Send data to the n8n summary webhook (patient summaries)."""
-        response = requests.post(self.N8N_SUMMARY_WEBHOOK_URL, json=data)
+        # Bounded, since queued summaries share one delivery worker
+        response = requests.post(
+            self.N8N_SUMMARY_WEBHOOK_URL,
+            json=data,
+            timeout=(10, config.get_timeout("n8n_summary_webhook", 120)),
+        )
         return response
 
     def _send_to_insurance_webhook_n8n(self, data):
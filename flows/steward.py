@@ -296,18 +296,6 @@ class StewardFlow(BaseFlow):
         logger.info("[STEP 5] Meditech session opened")
         return True
 
-    def _check_element_exists(self, image_path, confidence=None):
-        """Quickly check if an element exists on screen without waiting."""
-        if confidence is None:
-            confidence = self.confidence
-        try:
-            location = pyautogui.locateOnScreen(image_path, confidence=confidence)
-            return location is not None
-        except pyautogui.ImageNotFoundException:
-            return False
-        except Exception:
-            return False
-
     def _reset_existing_session(self):
         """Reset an already-open Meditech session."""
         # Click Reset button
@@ -12,9 +12,10 @@ from datetime import datetime
 from typing import Optional
 
 import pydirectinput
-import pyperclip
 
 from config import config
+from core import clipboard
+from core.system_utils import send_key_batch, VK_A, VK_C, VK_CONTROL
 from core.vdi_input import stoppable_sleep
 from logger import logger
 
@@ -43,6 +44,7 @@ class StewardInsuranceFlow(BaseFlow):
     FLOW_NAME = "Steward Patient Insurance"
     FLOW_TYPE = "steward_patient_insurance"
     EMR_TYPE = "steward"
+    MEDITECH_WINDOW_TITLE = "Meditech"
 
     def __init__(self):
         super().__init__()
@@ -111,12 +113,10 @@ class StewardInsuranceFlow(BaseFlow):
             self._cleanup_and_return_to_lobby()
 
             # Notify webhook that patient was not found
-            result = {
-                "patient_name": self.patient_name,
-                "content": None,
-                "patient_found": False,
-                "error": f"Patient '{self.patient_name}' not found in patient list",
-            }
+            result = self._make_result(
+                found=False,
+                error=f"Patient '{self.patient_name}' not found in patient list",
+            )
             self.notify_completion(result)
             return result
 
@@ -133,12 +133,7 @@ class StewardInsuranceFlow(BaseFlow):
             else:
                 self._cleanup_and_return_to_lobby()
 
-            return {
-                "patient_name": self.patient_name,
-                "content": None,
-                "patient_found": False,
-                "error": error_msg,
-            }
+            return self._make_result(found=False, error=error_msg)
 
         logger.info("[STEWARD INSURANCE] Phase 2: Complete - Patient clicked")
 
@@ -154,10 +149,24 @@ class StewardInsuranceFlow(BaseFlow):
 
         logger.info("[STEWARD INSURANCE] Flow complete")
 
+        return self._make_result(found=True)
+
+    def _make_result(self, found: bool, error: Optional[str] = None) -> dict:
+        """
+        Build the result dict returned by execute() and sent to n8n.
+
+        Args:
+            found: Whether the patient was found and content extracted
+            error: Optional error message (patient not found / agent failure)
+        """
+        content = None
+        if found:
+            content = self.copied_content or "[ERROR] No content extracted"
         return {
             "patient_name": self.patient_name,
-            "content": self.copied_content or "[ERROR] No content extracted",
-            "patient_found": True,
+            "content": content,
+            "patient_found": found,
+            "error": error,
         }
 
     def _phase1_navigate_to_patient_list(self):
@@ -193,8 +202,10 @@ class StewardInsuranceFlow(BaseFlow):
 
         logger.info("[PHASE 1] step6_load_menu visible - Patient list is ready")
 
-        # Give time for the patient list to fully render
-        stoppable_sleep(2)
+        # Wait for the patient list to finish rendering (screen stops changing)
+        self.wait_until_stable(
+            region=self._get_window_region(self.MEDITECH_WINDOW_TITLE), max_wait=2.0
+        )
 
     def _phase2_agentic_find_and_click_patient(self) -> tuple:
         """
@@ -234,7 +245,7 @@ class StewardInsuranceFlow(BaseFlow):
         logger.info(
             f"[STEWARD INSURANCE] Agent completed in {result.steps_taken} steps"
         )
-        stoppable_sleep(2)
+        # No settle delay: Phase 3 starts by polling for the Administrative tab
         return ("success", None, True)
 
     def _phase3_extract_insurance_content(self):
@@ -253,6 +264,11 @@ class StewardInsuranceFlow(BaseFlow):
         """
         self.set_step("PHASE3_EXTRACT_INSURANCE_CONTENT")
 
+        # Restrict template matching to the Meditech window (None = full screen)
+        region = self._get_window_region(self.MEDITECH_WINDOW_TITLE)
+        if region:
+            logger.info(f"[PHASE 3] Searching within Meditech window {region}")
+
         # Step 1: Click Administrative Tab
         logger.info("[PHASE 3] Step 1: Clicking Administrative Tab...")
         tab_admin_img = config.get_rpa_setting(
@@ -262,47 +278,61 @@ class StewardInsuranceFlow(BaseFlow):
             tab_admin_img,
             timeout=15,
             confidence=0.8,
+            region=region,
             description="Administrative Tab",
         )
         if not location:
             raise Exception("Administrative Tab not found")
+        admin_img = config.get_rpa_setting("images.steward_insurance_administrative")
         self.safe_click(location, "Administrative Tab")
-        stoppable_sleep(3)
+        # Continue as soon as the next target renders instead of a fixed delay
+        self._wait_until(
+            lambda: self._check_element_exists(admin_img, region=region), timeout=5
+        )
 
         # Step 2: Click Administrative menu item
         logger.info("[PHASE 3] Step 2: Clicking Administrative menu item...")
-        admin_img = config.get_rpa_setting("images.steward_insurance_administrative")
         location = self.wait_for_element(
             admin_img,
             timeout=15,
             confidence=0.8,
+            region=region,
             description="Administrative menu",
         )
         if not location:
             raise Exception("Administrative menu not found")
+        demographics_img = config.get_rpa_setting(
+            "images.steward_insurance_demographics"
+        )
         self.safe_click(location, "Administrative menu")
-        stoppable_sleep(2)
+        self._wait_until(
+            lambda: self._check_element_exists(demographics_img, region=region),
+            timeout=5,
+        )
 
         # Step 3: Click Demographics
         logger.info("[PHASE 3] Step 3: Clicking Demographics...")
-        demographics_img = config.get_rpa_setting(
-            "images.steward_insurance_demographics"
-        )
         location = self.wait_for_element(
             demographics_img,
             timeout=15,
             confidence=0.8,
+            region=region,
             description="Demographics",
         )
         if not location:
             raise Exception("Demographics not found")
+        insurance_img = config.get_rpa_setting("images.steward_insurance_insurance")
+        general_img = config.get_rpa_setting("images.steward_insurance_general")
+        general_selected_img = config.get_rpa_setting(
+            "images.steward_insurance_general_selected"
+        )
         self.safe_click(location, "Demographics")
-        stoppable_sleep(2)
+        self._wait_until(
+            lambda: self._check_element_exists(insurance_img, region=region), timeout=5
+        )
 
         # Step 4 & 5: Click Insurance and Verify with General (Retry Logic)
         logger.info("[PHASE 3] Step 4: Clicking Insurance...")
-        insurance_img = config.get_rpa_setting("images.steward_insurance_insurance")
-        general_img = config.get_rpa_setting("images.steward_insurance_general")
 
         max_retries = 1
         for attempt in range(max_retries + 1):
@@ -311,12 +341,16 @@ class StewardInsuranceFlow(BaseFlow):
                 insurance_img,
                 timeout=15,
                 confidence=0.8,
+                region=region,
                 description="Insurance",
             )
             if not location:
                 raise Exception("Insurance button not found")
             self.safe_click(location, "Insurance")
-            stoppable_sleep(2)
+            self._wait_until(
+                lambda: self._check_element_exists(general_img, region=region),
+                timeout=5,
+            )
 
             # Check for General (Verification)
             logger.info(
@@ -327,6 +361,7 @@ class StewardInsuranceFlow(BaseFlow):
                 general_img,
                 timeout=20,
                 confidence=0.8,
+                region=region,
                 description="General",
             )
 
@@ -334,7 +369,12 @@ class StewardInsuranceFlow(BaseFlow):
                 # Found it! Click to focus and break loop
                 logger.info("[PHASE 3] General tab found, clicking to focus...")
                 self.safe_click(location, "General")
-                stoppable_sleep(2)
+                self._wait_until(
+                    lambda: self._check_element_exists(
+                        general_selected_img, region=region
+                    ),
+                    timeout=5,
+                )
                 break
             else:
                 if attempt < max_retries:
@@ -346,38 +386,48 @@ class StewardInsuranceFlow(BaseFlow):
 
         # Step 6: Clear clipboard and Select All + Copy
         logger.info("[PHASE 3] Step 6: Selecting all and copying content...")
-        pyperclip.copy("")
-        stoppable_sleep(0.3)
-
-        # Ctrl+A to select all
-        pydirectinput.keyDown("ctrl")
-        stoppable_sleep(0.1)
-        pydirectinput.press("a")
-        stoppable_sleep(0.1)
-        pydirectinput.keyUp("ctrl")
-        stoppable_sleep(0.5)
+        clipboard.clear()
 
-        # Ctrl+C to copy
-        pydirectinput.keyDown("ctrl")
-        stoppable_sleep(0.1)
-        pydirectinput.press("c")
-        stoppable_sleep(0.1)
-        pydirectinput.keyUp("ctrl")
+        # Ctrl+A then Ctrl+C, delivered as one ordered SendInput batch
+        try:
+            send_key_batch(
+                [
+                    (VK_CONTROL, False),
+                    (VK_A, False),
+                    (VK_A, True),
+                    (VK_CONTROL, True),
+                    (VK_CONTROL, False),
+                    (VK_C, False),
+                    (VK_C, True),
+                    (VK_CONTROL, True),
+                ]
+            )
+        except Exception as e:
+            logger.warning(
+                f"[PHASE 3] SendInput batch failed: {e}, falling back to pydirectinput"
+            )
+            for key in ("a", "c"):
+                pydirectinput.keyDown("ctrl")
+                stoppable_sleep(0.1)
+                pydirectinput.press(key)
+                stoppable_sleep(0.1)
+                pydirectinput.keyUp("ctrl")
+                stoppable_sleep(0.5)
+
+        # Allow the copy to sync to the local clipboard
         stoppable_sleep(0.5)
 
         # Get copied content
-        self.copied_content = pyperclip.paste()
+        self.copied_content = clipboard.read_text()
         logger.info(f"[PHASE 3] Copied {len(self.copied_content)} characters")
 
         # Step 7: Click General (selected) to deselect
         logger.info("[PHASE 3] Step 7: Clicking General selected to deselect...")
-        general_selected_img = config.get_rpa_setting(
-            "images.steward_insurance_general_selected"
-        )
         location = self.wait_for_element(
             general_selected_img,
             timeout=10,
             confidence=0.8,
+            region=region,
             description="General (selected)",
         )
         if location:
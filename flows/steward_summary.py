@@ -16,14 +16,20 @@ Note: This follows the same pattern as Jackson and Baptist flows.
 The runner finds the report, the flow captures content and cleans up.
 """
 
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import cached_property
 from typing import Optional
+from uuid import uuid4
 
 import pyautogui
 import pydirectinput
 import pyperclip
 
 from config import config
+from core import notification_queue
+from core.template_cache import preload_templates
 from core.vdi_input import stoppable_sleep
 from logger import logger
 
@@ -31,10 +37,20 @@ from .base_flow import BaseFlow
 from .steward import StewardFlow
 
 from agentic.models import AgentStatus
-from agentic.omniparser_client import start_warmup_async
+from agentic.omniparser_client import start_warmup_async, wait_for_warmup
 from agentic.runners import StewardSummaryRunner
 
 
+BANNER = "=" * 70
+
+
+def _log_summary_notification(future: Future):
+    """Log the outcome of a queued summary notification."""
+    if future.exception() is None:
+        status = future.result().status_code
+        logger.info(f"[N8N] Summary notification sent - Status: {status}")
+
+
 class StewardSummaryFlow(BaseFlow):
     """
     Hybrid RPA flow for retrieving patient summary from Steward Health (Meditech).
@@ -55,9 +71,73 @@ class StewardSummaryFlow(BaseFlow):
         self.copied_content: Optional[str] = None
         self.reason_for_exam: Optional[str] = None
         self.doctor_specialty: Optional[str] = None
+        self._warmup_future: Optional[Future] = None
+        self._warmup_started_at = 0.0
+
+        # Screen metrics are fixed for the lifetime of a flow run
+        self._screen_w, self._screen_h = pyautogui.size()
+        self._screen_center = (self._screen_w // 2, self._screen_h // 2)
+
+        # Phase 3 search regions (left, top, width, height). Kept generous so
+        # small layout shifts still match; the Print Report and OK Preview
+        # buttons have no fixed position and are still searched full screen.
+        w, h = self._screen_w, self._screen_h
+        self._roi_top = (0, 0, w, h * 2 // 5)  # document tab
+        self._roi_top_half = (0, 0, w, h // 2)  # tab context menu
+        self._roi_top_right = (w // 2, 0, w - w // 2, h // 2)  # close modal
 
-        # Reference to Steward flow for reusing navigation steps
-        self._steward_flow = StewardFlow()
+        # Arguments for the lazily created Steward flow (see _steward_flow)
+        self._steward_setup_args: tuple = (None, None, None, None)
+
+        self._resolve_assets()
+
+    @cached_property
+    def _steward_flow(self) -> StewardFlow:
+        """
+        Steward flow used only for its navigation steps.
+        Created on first use and set up with the arguments recorded by setup().
+        """
+        steward_flow = StewardFlow()
+        steward_flow.setup(*self._steward_setup_args)
+        return steward_flow
+
+    def _resolve_assets(self):
+        """
+        Resolve every image path and timeout used by this flow once, so the
+        hot Phase 1/3 paths read plain attributes instead of walking the config.
+        Flows are created per request, so a resolution change is still honored.
+        """
+        self._img_load_menu_6 = config.get_rpa_setting("images.steward_load_menu_6")
+        self._img_print_btn = config.get_rpa_setting("images.steward_print_report_btn")
+        self._img_ok_preview = config.get_rpa_setting("images.steward_ok_preview_btn")
+        self._img_tab_document = config.get_rpa_setting(
+            "images.steward_tab_document_btn"
+        )
+        self._img_close_tab = config.get_rpa_setting(
+            "images.steward_close_tab_document_btn"
+        )
+        self._img_close_modal = config.get_rpa_setting(
+            "images.steward_close_modal_document_detail"
+        )
+        self._timeout_menu = config.get_timeout("steward.menu")
+        self._timeout_warmup = config.get_timeout("omniparser.warmup")
+
+        # Decode Phase 1/3 and Phase 4 cleanup templates up front
+        preload_templates(
+            [
+                self._img_load_menu_6,
+                self._img_print_btn,
+                self._img_ok_preview,
+                self._img_tab_document,
+                self._img_close_tab,
+                self._img_close_modal,
+                config.get_rpa_setting("images.steward_close_meditech"),
+                config.get_rpa_setting("images.steward_tab_logged_out"),
+                config.get_rpa_setting("images.steward_close_tab"),
+                config.get_rpa_setting("images.steward_url"),
+                config.get_rpa_setting("images.common_vdi_desktop_tab"),
+            ]
+        )
 
     def setup(
         self,
@@ -84,10 +164,17 @@ class StewardSummaryFlow(BaseFlow):
         self.patient_name = patient_name
         self.doctor_specialty = doctor_specialty
 
-        # Also setup the internal Steward flow reference
-        self._steward_flow.setup(
-            execution_id, sender, instance, trigger_type, doctor_name, credentials
+        # Record the Steward flow setup; only re-run it if already created
+        self._steward_setup_args = (
+            execution_id,
+            sender,
+            instance,
+            trigger_type,
+            doctor_name,
+            credentials,
         )
+        if "_steward_flow" in self.__dict__:
+            self._steward_flow.setup(*self._steward_setup_args)
 
         logger.info(f"[STEWARD SUMMARY] Patient to find: {patient_name}")
         if doctor_specialty:
@@ -98,12 +185,14 @@ class StewardSummaryFlow(BaseFlow):
         if not self.patient_name:
             raise ValueError("Patient name is required for summary flow")
 
-        logger.info("=" * 70)
+        logger.info(BANNER)
         logger.info(" STEWARD SUMMARY FLOW - STARTING")
-        logger.info("=" * 70)
+        logger.info(BANNER)
 
-        # Start OmniParser warmup in background BEFORE Phase 1
-        start_warmup_async()
+        # Start OmniParser warmup in background BEFORE Phase 1; it overlaps
+        # the whole Phase 1 navigation and is only awaited before Phase 2
+        self._warmup_started_at = time.monotonic()
+        self._warmup_future = start_warmup_async()
 
         # =====================================================================
         # PHASE 1: Traditional RPA - Navigate to patient list
@@ -179,24 +268,30 @@ class StewardSummaryFlow(BaseFlow):
                 f"{self.copied_content}"
             )
 
-        logger.info(
-            f"[STEWARD SUMMARY] Phase 3 complete - {len(self.copied_content or '')} chars"
-        )
+        content_length = len(self.copied_content or "")
+        logger.info(f"[STEWARD SUMMARY] Phase 3 complete - {content_length} chars")
+
+        result = {
+            "patient_name": self.patient_name,
+            "content": self.copied_content,
+            "patient_found": True,
+            "reason_for_exam": self.reason_for_exam,
+        }
 
         # =====================================================================
         # PHASE 4: RPA - Cleanup and return to lobby
+        # The result is final, so the n8n webhook is queued before cleanup
+        # and delivered in the background
         # =====================================================================
+        self.notify_completion(result)
+        self._completion_notified = True
+
         logger.info("[STEWARD SUMMARY] Phase 4: Cleanup and return to lobby...")
         self._phase4_cleanup()
 
         logger.info("[STEWARD SUMMARY] Complete - Content ready")
 
-        return {
-            "patient_name": self.patient_name,
-            "content": self.copied_content,
-            "patient_found": True,
-            "reason_for_exam": self.reason_for_exam,
-        }
+        return result
 
     # =========================================================================
     # PHASE 1: RPA Navigation - IMPLEMENTED
@@ -226,10 +321,10 @@ class StewardSummaryFlow(BaseFlow):
         logger.info("[PHASE 1] Waiting for step6_load_menu (patient list visible)...")
 
         menu = self._steward_flow.robust_wait_for_element(
-            config.get_rpa_setting("images.steward_load_menu_6"),
+            self._img_load_menu_6,
             target_description="Menu (step 6) - Patient list visible",
             handlers=self._steward_flow._get_sign_list_handlers(),
-            timeout=config.get_timeout("steward.menu"),
+            timeout=self._timeout_menu,
         )
 
         if not menu:
@@ -237,8 +332,9 @@ class StewardSummaryFlow(BaseFlow):
 
         logger.info("[PHASE 1] step6_load_menu visible - Patient list is ready")
 
-        # Give time for the patient list to fully render
-        stoppable_sleep(2)
+        # Give the patient list time to fully render (settles early once the
+        # screen stops changing, instead of always sleeping 2s)
+        self.wait_until_stable(max_wait=2.0)
 
     # =========================================================================
     # PHASE 2: Agentic - Find patient, reason, and report
@@ -262,6 +358,8 @@ class StewardSummaryFlow(BaseFlow):
         """
         self.set_step("PHASE2_AGENTIC_FIND_DOCUMENT")
 
+        self._await_warmup()
+
         runner = StewardSummaryRunner(
             max_steps=50,
             step_delay=1.5,
@@ -287,6 +385,30 @@ class StewardSummaryFlow(BaseFlow):
         # Success - report found
         return ("success", None, True, result.reason_for_exam)
 
+    def _await_warmup(self):
+        """
+        Block until the OmniParser warmup started in execute() has finished.
+        Returns immediately when the warmup already completed during Phase 1.
+        """
+        if self._warmup_future is None:
+            return
+
+        overlap = round(time.monotonic() - self._warmup_started_at, 1)
+        if self._warmup_future.done():
+            logger.info(
+                f"[STEWARD SUMMARY] OmniParser warmup finished during Phase 1 "
+                f"(overlapped {overlap}s)"
+            )
+            return
+
+        wait_start = time.monotonic()
+        wait_for_warmup(timeout=self._timeout_warmup)
+        waited = round(time.monotonic() - wait_start, 1)
+        logger.info(
+            f"[STEWARD SUMMARY] Waited {waited}s for OmniParser warmup "
+            f"(overlapped {overlap}s with Phase 1)"
+        )
+
     # =========================================================================
     # PHASE 3: Capture Content - RPA
     # =========================================================================
@@ -306,8 +428,10 @@ class StewardSummaryFlow(BaseFlow):
         """
         self.set_step("PHASE3_CAPTURE_CONTENT")
 
+        print_btn = self._img_print_btn
+        tab_btn = self._img_tab_document
+
         # === Step 1: Click Print Report Button ===
-        print_btn = config.get_rpa_setting("images.steward_print_report_btn")
         logger.info("[PHASE 3] Waiting for Print Report button...")
         location = self.wait_for_element(
             print_btn, timeout=10, confidence=0.8, description="Print Report button"
@@ -316,114 +440,173 @@ class StewardSummaryFlow(BaseFlow):
             raise Exception("Print Report button not found")
 
         self.safe_click(location, "Print Report button")
-        stoppable_sleep(2)
 
         # === Step 2: Click OK Preview Button ===
-        ok_btn = config.get_rpa_setting("images.steward_ok_preview_btn")
         logger.info("[PHASE 3] Waiting for OK Preview button...")
         location = self.wait_for_element(
-            ok_btn, timeout=15, confidence=0.8, description="OK Preview button"
+            self._img_ok_preview,
+            timeout=15,
+            confidence=0.8,
+            description="OK Preview button",
         )
         if not location:
             raise Exception("OK Preview button not found")
 
         self.safe_click(location, "OK Preview button")
-        stoppable_sleep(3)
 
         # === Step 3: Wait for Document Tab (indicates content loaded) ===
-        tab_btn = config.get_rpa_setting("images.steward_tab_document_btn")
         logger.info("[PHASE 3] Waiting for document tab to appear...")
-        location = self.wait_for_element(
-            tab_btn, timeout=30, confidence=0.8, description="Document tab"
+        tab_location = self.wait_for_element(
+            tab_btn,
+            timeout=30,
+            confidence=0.8,
+            description="Document tab",
+            region=self._roi_top,
         )
-        if not location:
+        if not tab_location:
             raise Exception("Document tab not found - content may not have loaded")
 
         logger.info(
             "[PHASE 3] Document tab visible - waiting for content to fully load..."
         )
-        stoppable_sleep(3)
+        # Content is loaded once the screen stops changing (max 3s, as before)
+        self.wait_until_stable(max_wait=3.0)
 
         # === Step 4: Click Center + Ctrl+A + Ctrl+C to Copy ===
         logger.info("[PHASE 3] Clicking center and copying content...")
-        screen_w, screen_h = pyautogui.size()
-        pyautogui.click(screen_w // 2, screen_h // 2)
+        pyautogui.click(*self._screen_center)
         stoppable_sleep(0.5)
 
-        # Clear clipboard first
-        pyperclip.copy("")
-        stoppable_sleep(0.3)
+        # Mark the clipboard with a unique sentinel instead of clearing it, so
+        # new content is detected without racing a clear
+        sentinel = f"__HANNA_{uuid4().hex}__"
+        pyperclip.copy(sentinel)
 
-        # Select all with Ctrl+A
-        pydirectinput.keyDown("ctrl")
-        stoppable_sleep(0.1)
-        pydirectinput.press("a")
-        stoppable_sleep(0.1)
-        pydirectinput.keyUp("ctrl")
-        stoppable_sleep(0.5)
+        # Select all with Ctrl+A, then copy with Ctrl+C
+        self._send_hotkey("ctrl", "a")
+        self._send_hotkey("ctrl", "c")
 
-        # Copy with Ctrl+C
-        pydirectinput.keyDown("ctrl")
-        stoppable_sleep(0.1)
-        pydirectinput.press("c")
-        stoppable_sleep(0.1)
-        pydirectinput.keyUp("ctrl")
-        stoppable_sleep(0.5)
+        # Poll until the copied text replaces the sentinel
+        copied_text = sentinel
 
-        # Get copied content
-        self.copied_content = pyperclip.paste()
-        logger.info(f"[PHASE 3] Copied {len(self.copied_content)} characters")
+        def _clipboard_changed():
+            nonlocal copied_text
+            copied_text = pyperclip.paste()
+            return copied_text != sentinel
 
-        # === Step 5: Right-click on Document Tab ===
-        logger.info("[PHASE 3] Right-clicking on document tab...")
-        location = self.wait_for_element(
-            tab_btn, timeout=5, confidence=0.8, description="Document tab (right-click)"
-        )
-        if location:
-            center = pyautogui.center(location)
-            pyautogui.rightClick(center.x, center.y)
-            stoppable_sleep(1)
-        else:
-            logger.warning(
-                "[PHASE 3] Could not find tab for right-click, trying center"
-            )
-            pyautogui.rightClick(screen_w // 2, 50)
-            stoppable_sleep(1)
+        if not self._wait_until(_clipboard_changed, timeout=3, initial=0.05):
+            logger.warning("[PHASE 3] Clipboard did not change after Ctrl+C")
+            copied_text = ""
 
-        # === Step 6: Click Close Tab Document Button ===
-        close_tab_btn = config.get_rpa_setting("images.steward_close_tab_document_btn")
-        logger.info("[PHASE 3] Clicking close tab button...")
-        location = self.wait_for_element(
-            close_tab_btn, timeout=5, confidence=0.7, description="Close tab button"
-        )
-        if location:
-            self.safe_click(location, "Close tab button")
-            stoppable_sleep(2)
-        else:
-            # Try pressing Escape as fallback
-            logger.warning("[PHASE 3] Close tab button not found, trying Escape")
-            pydirectinput.press("escape")
-            stoppable_sleep(1)
+        # Get copied content
+        self.copied_content = copied_text
+        copied_length = len(self.copied_content)
+        logger.info(f"[PHASE 3] Copied {copied_length} characters")
+
+        close_modal_btn = self._img_close_modal
+
+        # Try the configured keyboard shortcut first; fall back to the
+        # right-click menu + close button image search if it doesn't work
+        if not self._close_document_tab_with_shortcut(tab_btn, tab_location):
+            # === Step 5: Right-click on Document Tab ===
+            # The tab has not moved since step 3; only re-locate it if the copy
+            # came back empty (the tab may have been closed in the meantime)
+            logger.info("[PHASE 3] Right-clicking on document tab...")
+            location = tab_location
+            if not self.copied_content:
+                location = self.wait_for_element(
+                    tab_btn,
+                    timeout=5,
+                    confidence=0.8,
+                    description="Document tab (right-click)",
+                    region=self._roi_top,
+                )
+            if location:
+                center = pyautogui.center(location)
+                pyautogui.rightClick(center.x, center.y)
+            else:
+                logger.warning(
+                    "[PHASE 3] Could not find tab for right-click, trying center"
+                )
+                pyautogui.rightClick(self._screen_center[0], 50)
+
+            # === Step 6: Click Close Tab Document Button ===
+            # No settle delay after the right-click: the wait below polls for
+            # the context menu item as soon as it paints
+            close_tab_btn = self._img_close_tab
+            logger.info("[PHASE 3] Clicking close tab button...")
+            location = self.wait_for_element(
+                close_tab_btn,
+                timeout=5,
+                confidence=0.7,
+                description="Close tab button",
+                region=self._roi_top_half,
+            )
+            if location:
+                self.safe_click(location, "Close tab button")
+                self._wait_until(
+                    lambda: self._check_element_exists(
+                        close_modal_btn, region=self._roi_top_right
+                    ),
+                    timeout=5,
+                    initial=0.05,
+                )
+            else:
+                # Try pressing Escape as fallback
+                logger.warning("[PHASE 3] Close tab button not found, trying Escape")
+                pydirectinput.press("escape")
 
         # === Step 7: Click Close Modal Document Detail ===
-        close_modal_btn = config.get_rpa_setting(
-            "images.steward_close_modal_document_detail"
-        )
         logger.info("[PHASE 3] Clicking close modal button...")
         location = self.wait_for_element(
             close_modal_btn,
             timeout=10,
             confidence=0.8,
             description="Close modal button",
+            region=self._roi_top_right,
         )
         if location:
             self.safe_click(location, "Close modal button")
-            stoppable_sleep(2)
+            self._wait_until(
+                lambda: not self._check_element_exists(
+                    close_modal_btn, region=self._roi_top_right
+                ),
+                timeout=2,
+                initial=0.05,
+            )
         else:
             logger.warning("[PHASE 3] Close modal button not found")
 
         logger.info("[PHASE 3] Content capture complete")
 
+    def _close_document_tab_with_shortcut(self, tab_btn, tab_location) -> bool:
+        """
+        Close the document tab with the shortcut configured in
+        shortcuts.steward_close_document_tab (e.g. ["ctrl", "f4"]).
+        Disabled when the setting is empty, since shortcut support depends on
+        the Meditech/VDI setup (Ctrl+F4 may reach the browser instead).
+
+        Returns:
+            True if the tab is confirmed closed, False to use the menu fallback
+        """
+        keys = config.get_rpa_setting("shortcuts.steward_close_document_tab")
+        if not keys or not tab_location:
+            return False
+
+        logger.info(f"[PHASE 3] Closing document tab with {'+'.join(keys)}...")
+        self._send_hotkey(*keys)
+
+        # Cheap check: only the tab's own bounding box is searched
+        tab_region = tuple(int(v) for v in tab_location)
+        closed = self._wait_until(
+            lambda: not self._check_element_exists(tab_btn, region=tab_region),
+            timeout=1,
+            initial=0.05,
+        )
+        if not closed:
+            logger.warning("[PHASE 3] Shortcut did not close the document tab")
+        return closed
+
     # =========================================================================
     # PHASE 4: Cleanup - Return to lobby
     # =========================================================================
@@ -488,14 +671,23 @@ class StewardSummaryFlow(BaseFlow):
             # Close Meditech - step_15 handles multiple clicks automatically
             self._steward_flow.step_15_close_meditech()
 
-            # Right click on logged out tab
-            self._steward_flow.step_16_tab_logged_out()
+            if config.get_rpa_setting("cleanup.parallel", False):
+                # Reset URL while the logged-out tab is being closed.
+                # Both drive the same mouse/keyboard, so this is opt-in.
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    url_future = executor.submit(self._steward_flow.step_18_url)
+                    self._steward_flow.step_16_tab_logged_out()
+                    self._steward_flow.step_17_close_tab_final()
+                    url_future.result()
+            else:
+                # Right click on logged out tab
+                self._steward_flow.step_16_tab_logged_out()
 
-            # Close tab final
-            self._steward_flow.step_17_close_tab_final()
+                # Close tab final
+                self._steward_flow.step_17_close_tab_final()
 
-            # Reset URL to Horizon home
-            self._steward_flow.step_18_url()
+                # Reset URL to Horizon home
+                self._steward_flow.step_18_url()
 
             # Return to VDI Desktop
             self._steward_flow.step_19_vdi_tab()
@@ -519,8 +711,13 @@ class StewardSummaryFlow(BaseFlow):
     # NOTIFICATION
     # =========================================================================
 
-    def notify_completion(self, result):
-        """Notify n8n of completion."""
+    def notify_completion(self, result, sync=False):
+        """
+        Notify n8n of completion.
+        The webhook is queued for background delivery (with retries) and a
+        Future for the response is returned; pass sync=True to send it inline
+        and get the response directly.
+        """
         patient_found = result.get("patient_found", True)
         payload = {
             "execution_id": self.execution_id,
@@ -538,6 +735,13 @@ class StewardSummaryFlow(BaseFlow):
             "doctor_name": self.doctor_name,
             "doctor_specialty": self.doctor_specialty,
         }
-        response = self._send_to_summary_webhook_n8n(payload)
-        logger.info(f"[N8N] Summary notification sent - Status: {response.status_code}")
-        return response
+        if sync:
+            response = self._send_to_summary_webhook_n8n(payload)
+            logger.info(
+                f"[N8N] Summary notification sent - Status: {response.status_code}"
+            )
+            return response
+
+        future = notification_queue.submit(self._send_to_summary_webhook_n8n, payload)
+        future.add_done_callback(_log_summary_notification)
+        return future
@@ -1,23 +1,29 @@
+import atexit
 import customtkinter as ctk
 from tkinter import messagebox
-import requests
 import threading
+import selectors
+import socket
 import subprocess
 import time
 import sys
 import platform
+from functools import cached_property, lru_cache
 from pathlib import Path
-import uvicorn
 from config import config
 from tunnel_manager import TunnelManager
 from logger import logger
 from services import AuthService
 from services.lobby_service import start_lobby_service, stop_lobby_service
+from services.scheduler import schedule_periodic
 from version import __version__, __app_name__
 
 if platform.system() == "Windows":
     import winreg
 
+AUTOSTART_KEY_PATH = r"Software\Microsoft\Windows\CurrentVersion\Run"
+AUTOSTART_VALUE_NAME = "HannaMedRPA"
+
 ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("blue")
 
@@ -27,13 +33,19 @@ SECONDARY_BG = "#F2F8FF"
 SUCCESS_COLOR = "#10B981"
 ERROR_COLOR = "#EF4444"
 
+WINDOW_WIDTH = 500
+WINDOW_HEIGHT = 500
+
+# Minimum time between status text redraws (~15 Hz)
+STATUS_MIN_INTERVAL_MS = 66
+
 
 class RPAApplication(ctk.CTk):
     def __init__(self):
         super().__init__()
 
         self.title("Hanna-Med MA - Medical Assistant")
-        self.geometry("500x500")
+        self.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")
         self.resizable(False, False)
 
         self.center_window()
@@ -43,29 +55,105 @@ class RPAApplication(ctk.CTk):
         self.server_process = None
         self.tunnel_manager = TunnelManager()
         self.tunnel_config = None
-        self.heartbeat_thread = None
-        self.should_heartbeat = False
+        self._heartbeat_task = None
         self.auth_service = AuthService()
+        self._uv_server = None
+        self._server_thread = None
+        self._server_ready = threading.Event()
+        self._server_stop_requested = threading.Event()
+
+        # Wakeup pair + flag that let stop_agent cancel wait_for_server
+        self._startup_wakeup_r, self._startup_wakeup_w = socket.socketpair()
+        self._startup_wakeup_r.setblocking(False)
+        self._startup_cancelled = threading.Event()
+
+        # Status text rate limiting (see update_status_message)
+        self._pending_status = None
+        self._status_flush_scheduled = False
+        self._last_status_ts = 0.0
+
+        self._settings_status_clear_id = None
+
+        self._autostart_key = None
+        if platform.system() == "Windows":
+            atexit.register(self._close_autostart_key)
+
+        # Screens are built once and swapped with pack/pack_forget
+        self._login_frame = None
+        self._dashboard_frame = None
 
         self.show_login_screen()
 
+    @cached_property
+    def _http(self):
+        """
+        Shared HTTP session for backend calls (tunnel config, heartbeats).
+        Built on first use so requests stays off the startup path; keep-alive
+        connections are reused across calls.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        # One quick retry on gateway errors so a single blip doesn't fail a call
+        retry = Retry(
+            total=1,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=["POST"],
+        )
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _font(size, weight="normal"):
+        """
+        Shared CTkFont per (size, weight). Fonts are named Tk objects that
+        outlive the widgets using them, so screen rebuilds can reuse them.
+        """
+        return ctk.CTkFont(size=size, weight=weight)
+
+    def _ui(self, fn, *args, **kwargs):
+        """
+        Run a UI update on the Tk main thread.
+        Called directly when already on the main thread; otherwise queued with
+        after(0), which Tk processes on its next event loop pass.
+        """
+        if threading.current_thread() is threading.main_thread():
+            fn(*args, **kwargs)
+        elif kwargs:
+            self.after(0, lambda: fn(*args, **kwargs))
+        else:
+            self.after(0, fn, *args)
+
     def center_window(self):
-        self.update_idletasks()
-        width = self.winfo_width()
-        height = self.winfo_height()
+        # The window size is fixed, so only the screen size needs querying
+        width, height = WINDOW_WIDTH, WINDOW_HEIGHT
         x = (self.winfo_screenwidth() // 2) - (width // 2)
         y = (self.winfo_screenheight() // 2) - (height // 2)
         self.geometry(f"{width}x{height}+{x}+{y}")
 
-    def clear_window(self):
-        for widget in self.winfo_children():
-            widget.destroy()
-
     def show_login_screen(self):
-        self.clear_window()
+        """Show the login screen, building it on first use."""
+        if self._dashboard_frame is not None:
+            self._dashboard_frame.pack_forget()
 
+        if self._login_frame is None:
+            self._login_frame = self._build_login_screen()
+        else:
+            self.username_entry.delete(0, "end")
+            self.password_entry.delete(0, "end")
+            self.status_label.configure(text="")
+            self.login_button.configure(state="normal", text="Sign In")
+
+        self._login_frame.pack(expand=True, fill="both")
+
+    def _build_login_screen(self):
         main_frame = ctk.CTkFrame(self, fg_color=SECONDARY_BG)
-        main_frame.pack(expand=True, fill="both")
 
         content_frame = ctk.CTkFrame(
             main_frame, fg_color="white", corner_radius=12, width=380, height=420
@@ -75,7 +163,7 @@ class RPAApplication(ctk.CTk):
         title_label = ctk.CTkLabel(
             content_frame,
             text="Hanna-Med MA",
-            font=ctk.CTkFont(size=28, weight="bold"),
+            font=self._font(28, "bold"),
             text_color=PRIMARY_COLOR,
         )
         title_label.pack(pady=(30, 5))
@@ -83,7 +171,7 @@ class RPAApplication(ctk.CTk):
         subtitle_label = ctk.CTkLabel(
             content_frame,
             text="RPA Agent - Doctor Login",
-            font=ctk.CTkFont(size=13),
+            font=self._font(13),
             text_color="gray",
         )
         subtitle_label.pack(pady=(0, 30))
@@ -91,7 +179,7 @@ class RPAApplication(ctk.CTk):
         username_label = ctk.CTkLabel(
             content_frame,
             text="Username",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=self._font(13, "bold"),
             anchor="w",
         )
         username_label.pack(pady=(0, 5), padx=30, fill="x")
@@ -100,7 +188,7 @@ class RPAApplication(ctk.CTk):
             content_frame,
             placeholder_text="Enter your username",
             height=38,
-            font=ctk.CTkFont(size=13),
+            font=self._font(13),
             border_color="#E5E7EB",
             fg_color="white",
         )
@@ -109,7 +197,7 @@ class RPAApplication(ctk.CTk):
         password_label = ctk.CTkLabel(
             content_frame,
             text="Password",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=self._font(13, "bold"),
             anchor="w",
         )
         password_label.pack(pady=(0, 5), padx=30, fill="x")
@@ -119,7 +207,7 @@ class RPAApplication(ctk.CTk):
             placeholder_text="Enter your password",
             show="•",
             height=38,
-            font=ctk.CTkFont(size=13),
+            font=self._font(13),
             border_color="#E5E7EB",
             fg_color="white",
         )
@@ -128,7 +216,7 @@ class RPAApplication(ctk.CTk):
         self.password_entry.bind("<Return>", lambda e: self.perform_login())
 
         self.status_label = ctk.CTkLabel(
-            content_frame, text="", font=ctk.CTkFont(size=12), text_color=ERROR_COLOR
+            content_frame, text="", font=self._font(12), text_color=ERROR_COLOR
         )
         self.status_label.pack(pady=(0, 10))
 
@@ -137,7 +225,7 @@ class RPAApplication(ctk.CTk):
             text="Sign In",
             command=self.perform_login,
             height=42,
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=self._font(14, "bold"),
             corner_radius=8,
             fg_color=PRIMARY_COLOR,
             hover_color=PRIMARY_HOVER,
@@ -147,11 +235,13 @@ class RPAApplication(ctk.CTk):
         footer_label = ctk.CTkLabel(
             content_frame,
             text=f"{__app_name__} v{__version__}",
-            font=ctk.CTkFont(size=11),
+            font=self._font(11),
             text_color="gray",
         )
         footer_label.pack(pady=(0, 20))
 
+        return main_frame
+
     def perform_login(self):
         username = self.username_entry.get().strip()
         password = self.password_entry.get().strip()
@@ -174,31 +264,45 @@ class RPAApplication(ctk.CTk):
 
         if result["success"]:
             self.doctor_data = result["doctor"]
-            self.after(0, self.show_dashboard)
+            self._ui(self.show_dashboard)
         else:
             error_msg = result.get("error", "Authentication failed")
-            self.after(0, lambda: self.show_login_error(error_msg))
+            self._ui(self.show_login_error, error_msg)
 
     def show_login_error(self, message):
         self.login_button.configure(state="normal", text="Sign In")
         self.status_label.configure(text=message, text_color=ERROR_COLOR)
 
     def show_dashboard(self):
-        self.clear_window()
+        """
+        Show the dashboard, building it on first use. Later logins only
+        refresh the doctor-specific text.
+        """
+        if self._login_frame is not None:
+            self._login_frame.pack_forget()
+
+        if self._dashboard_frame is None:
+            self._dashboard_frame = self._build_dashboard()
+        else:
+            self.welcome_label.configure(
+                text=f"Welcome, {self.doctor_data.get('name', 'Doctor')}"
+            )
+
+        self._dashboard_frame.pack(expand=True, fill="both")
 
+    def _build_dashboard(self):
         main_frame = ctk.CTkFrame(self, fg_color=SECONDARY_BG)
-        main_frame.pack(expand=True, fill="both")
 
         header_frame = ctk.CTkFrame(main_frame, fg_color="white")
         header_frame.pack(fill="x", padx=20, pady=(20, 15))
 
-        welcome_label = ctk.CTkLabel(
+        self.welcome_label = ctk.CTkLabel(
             header_frame,
             text=f"Welcome, {self.doctor_data.get('name', 'Doctor')}",
-            font=ctk.CTkFont(size=20, weight="bold"),
+            font=self._font(20, "bold"),
             text_color=PRIMARY_COLOR,
         )
-        welcome_label.pack(side="left", padx=15, pady=12)
+        self.welcome_label.pack(side="left", padx=15, pady=12)
 
         logout_button = ctk.CTkButton(
             header_frame,
@@ -206,7 +310,7 @@ class RPAApplication(ctk.CTk):
             command=self.logout,
             width=100,
             height=32,
-            font=ctk.CTkFont(size=12),
+            font=self._font(12),
             fg_color="#6B7280",
             hover_color="#4B5563",
             corner_radius=6,
@@ -219,7 +323,7 @@ class RPAApplication(ctk.CTk):
         self.agent_status_label = ctk.CTkLabel(
             status_frame,
             text="System Stopped",
-            font=ctk.CTkFont(size=24, weight="bold"),
+            font=self._font(24, "bold"),
             text_color=ERROR_COLOR,
         )
         self.agent_status_label.pack(pady=(30, 10))
@@ -227,7 +331,7 @@ class RPAApplication(ctk.CTk):
         self.status_message = ctk.CTkLabel(
             status_frame,
             text="The assistant is off. Click 'Start' to activate it.",
-            font=ctk.CTkFont(size=13),
+            font=self._font(13),
             text_color="#6B7280",
         )
         self.status_message.pack(pady=(0, 30))
@@ -237,7 +341,7 @@ class RPAApplication(ctk.CTk):
             text="Start Assistant",
             command=self.toggle_agent,
             height=50,
-            font=ctk.CTkFont(size=16, weight="bold"),
+            font=self._font(16, "bold"),
             fg_color=SUCCESS_COLOR,
             hover_color="#059669",
             corner_radius=10,
@@ -247,79 +351,89 @@ class RPAApplication(ctk.CTk):
         settings_frame = ctk.CTkFrame(main_frame, fg_color="white")
         settings_frame.pack(fill="x", padx=20, pady=(0, 20))
 
+        # Settings rows are laid out with grid directly in the card, so the
+        # resolution row needs no nested frame (each CTkFrame is a canvas)
+        settings_frame.grid_columnconfigure(2, weight=1)
+
         settings_title = ctk.CTkLabel(
             settings_frame,
             text="Settings",
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=self._font(14, "bold"),
             text_color=PRIMARY_COLOR,
             anchor="w",
         )
-        settings_title.pack(pady=(15, 15), padx=20, fill="x")
+        settings_title.grid(
+            row=0, column=0, columnspan=3, sticky="ew", padx=20, pady=(15, 15)
+        )
 
         # Resolution selector
-        resolution_frame = ctk.CTkFrame(settings_frame, fg_color="transparent")
-        resolution_frame.pack(fill="x", padx=20, pady=(0, 10))
-
         resolution_label = ctk.CTkLabel(
-            resolution_frame,
+            settings_frame,
             text="Screen Resolution:",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=self._font(12, "bold"),
             text_color="#374151",
             anchor="w",
         )
-        resolution_label.pack(side="left", padx=(0, 10))
+        resolution_label.grid(row=1, column=0, sticky="w", padx=(20, 10), pady=(0, 10))
 
         available_resolutions = config.get_available_resolutions()
         current_resolution = config.get_screen_resolution()
 
         self.resolution_var = ctk.StringVar(value=current_resolution)
         resolution_menu = ctk.CTkOptionMenu(
-            resolution_frame,
+            settings_frame,
             variable=self.resolution_var,
             values=available_resolutions,
             command=self.on_resolution_change,
-            font=ctk.CTkFont(size=12),
+            font=self._font(12),
             width=140,
             fg_color=PRIMARY_COLOR,
             button_color=PRIMARY_HOVER,
         )
-        resolution_menu.pack(side="left")
+        resolution_menu.grid(row=1, column=1, sticky="w", pady=(0, 10))
 
-        if platform.system() == "Windows":
+        is_windows = platform.system() == "Windows"
+
+        self.settings_status_label = ctk.CTkLabel(
+            settings_frame, text="", font=self._font(11), height=16, anchor="w"
+        )
+        self.settings_status_label.grid(
+            row=2,
+            column=0,
+            columnspan=3,
+            sticky="ew",
+            padx=20,
+            # Bottom padding of the card when there is no autostart option
+            pady=(0, 0 if is_windows else 15),
+        )
+
+        if is_windows:
             self.autostart_var = ctk.BooleanVar(value=self.is_autostart_enabled())
             autostart_checkbox = ctk.CTkCheckBox(
                 settings_frame,
                 text="Start automatically with Windows",
                 variable=self.autostart_var,
                 command=self.toggle_autostart,
-                font=ctk.CTkFont(size=12),
+                font=self._font(12),
                 text_color="#374151",
             )
-            autostart_checkbox.pack(pady=(5, 15), padx=20, anchor="w")
-        else:
-            # Add some padding if not on Windows
-            ctk.CTkLabel(settings_frame, text="").pack(pady=7)
+            autostart_checkbox.grid(
+                row=3, column=0, columnspan=3, sticky="w", padx=20, pady=(5, 15)
+            )
+
+        return main_frame
 
     def is_autostart_enabled(self) -> bool:
         if platform.system() != "Windows":
             return False
 
         try:
-            key = winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                r"Software\Microsoft\Windows\CurrentVersion\Run",
-                0,
-                winreg.KEY_READ,
-            )
-            try:
-                winreg.QueryValueEx(key, "HannaMedRPA")
-                winreg.CloseKey(key)
-                return True
-            except FileNotFoundError:
-                winreg.CloseKey(key)
-                return False
+            winreg.QueryValueEx(self._get_autostart_key(), AUTOSTART_VALUE_NAME)
+            return True
+        except FileNotFoundError:
+            return False
         except Exception as e:
-            logger.warning(f"Error checking auto-start: {e}")
+            logger.warning("Error checking auto-start: %s", e)
             return False
 
     def on_resolution_change(self, new_resolution):
@@ -327,18 +441,50 @@ class RPAApplication(ctk.CTk):
         try:
             # Save the new resolution to config
             if config.set_screen_resolution(new_resolution):
-                logger.info(f"Resolution changed to: {new_resolution}")
-                messagebox.showinfo(
-                    "Resolution Updated",
-                    f"Screen resolution set to {new_resolution}.\n\n"
-                    "The new resolution will be used the next time the assistant starts.",
+                logger.info("Resolution changed to: %s", new_resolution)
+                self.show_settings_status(
+                    f"Resolution set to {new_resolution} (applies on next start)"
                 )
             else:
                 logger.error("Failed to save resolution")
-                messagebox.showerror("Error", "Could not save resolution setting")
+                self.show_settings_status(
+                    "Could not save resolution setting", ERROR_COLOR
+                )
         except Exception as e:
-            logger.error(f"Error changing resolution: {e}")
-            messagebox.showerror("Error", f"Could not change resolution: {str(e)}")
+            logger.error("Error changing resolution: %s", e)
+            self.show_settings_status(
+                f"Could not change resolution: {str(e)}", ERROR_COLOR
+            )
+
+    def show_settings_status(self, message, color=SUCCESS_COLOR):
+        """Show a short inline message under the settings; clears after 3s."""
+        if self._settings_status_clear_id is not None:
+            self.after_cancel(self._settings_status_clear_id)
+        self.settings_status_label.configure(text=message, text_color=color)
+        self._settings_status_clear_id = self.after(3000, self._clear_settings_status)
+
+    def _clear_settings_status(self):
+        self._settings_status_clear_id = None
+        self.settings_status_label.configure(text="")
+
+    def _get_autostart_key(self):
+        """
+        Handle to the HKCU Run key, opened once for both reading and writing.
+        Closed by _close_autostart_key on exit.
+        """
+        if self._autostart_key is None:
+            self._autostart_key = winreg.OpenKey(
+                winreg.HKEY_CURRENT_USER,
+                AUTOSTART_KEY_PATH,
+                0,
+                winreg.KEY_READ | winreg.KEY_SET_VALUE,
+            )
+        return self._autostart_key
+
+    def _close_autostart_key(self):
+        if self._autostart_key is not None:
+            winreg.CloseKey(self._autostart_key)
+            self._autostart_key = None
 
     def toggle_autostart(self):
         if platform.system() != "Windows":
@@ -347,12 +493,7 @@ class RPAApplication(ctk.CTk):
         enabled = self.autostart_var.get()
 
         try:
-            key = winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                r"Software\Microsoft\Windows\CurrentVersion\Run",
-                0,
-                winreg.KEY_SET_VALUE,
-            )
+            key = self._get_autostart_key()
 
             if enabled:
                 if getattr(sys, "frozen", False):
@@ -360,15 +501,15 @@ class RPAApplication(ctk.CTk):
                 else:
                     exe_path = f'"{sys.executable}" "{Path(__file__).absolute()}"'
 
-                winreg.SetValueEx(key, "HannaMedRPA", 0, winreg.REG_SZ, exe_path)
-                logger.info(f"Auto-start enabled: {exe_path}")
+                winreg.SetValueEx(key, AUTOSTART_VALUE_NAME, 0, winreg.REG_SZ, exe_path)
+                logger.info("Auto-start enabled: %s", exe_path)
                 messagebox.showinfo(
                     "Auto-start Enabled",
                     "The assistant will start automatically when you turn on your computer.",
                 )
             else:
                 try:
-                    winreg.DeleteValue(key, "HannaMedRPA")
+                    winreg.DeleteValue(key, AUTOSTART_VALUE_NAME)
                     logger.info("Auto-start disabled")
                     messagebox.showinfo(
                         "Auto-start Disabled",
@@ -377,24 +518,44 @@ class RPAApplication(ctk.CTk):
                 except FileNotFoundError:
                     pass
 
-            winreg.CloseKey(key)
-
         except Exception as e:
-            logger.error(f"Error toggling auto-start: {e}")
+            logger.error("Error toggling auto-start: %s", e)
             messagebox.showerror("Error", f"Could not change settings: {str(e)}")
             self.autostart_var.set(not enabled)
 
     def update_status_message(self, message):
-        if hasattr(self, "status_message"):
+        """
+        Set the dashboard status text, coalescing rapid updates.
+        Writes are capped at ~15 Hz; within that window only the latest
+        message is shown. Must be called on the Tk main thread.
+        """
+        self._pending_status = message
+        if self._status_flush_scheduled:
+            return
+
+        elapsed_ms = (time.monotonic() - self._last_status_ts) * 1000
+        if elapsed_ms >= STATUS_MIN_INTERVAL_MS:
+            self._flush_status()
+        else:
+            self._status_flush_scheduled = True
+            self.after(int(STATUS_MIN_INTERVAL_MS - elapsed_ms), self._flush_status)
+
+    def _flush_status(self):
+        self._status_flush_scheduled = False
+        message, self._pending_status = self._pending_status, None
+        if message is None or not hasattr(self, "status_message"):
+            return
+        if self.status_message.cget("text") != message:
             self.status_message.configure(text=message)
+        self._last_status_ts = time.monotonic()
 
     def update_status_display(self, running: bool):
         if running:
             self.agent_status_label.configure(
                 text="System Active", text_color=SUCCESS_COLOR
             )
-            self.status_message.configure(
-                text="The assistant is running. You will receive your reports automatically."
+            self.update_status_message(
+                "The assistant is running. You will receive your reports automatically."
             )
             self.toggle_button.configure(
                 text="Stop Assistant", fg_color=ERROR_COLOR, hover_color="#DC2626"
@@ -403,8 +564,8 @@ class RPAApplication(ctk.CTk):
             self.agent_status_label.configure(
                 text="System Stopped", text_color=ERROR_COLOR
             )
-            self.status_message.configure(
-                text="The assistant is off. Click 'Start' to activate it."
+            self.update_status_message(
+                "The assistant is off. Click 'Start' to activate it."
             )
             self.toggle_button.configure(
                 text="Start Assistant", fg_color=SUCCESS_COLOR, hover_color="#059669"
@@ -433,63 +594,64 @@ class RPAApplication(ctk.CTk):
             text="Starting System...", text_color="#F59E0B"
         )
 
+        # Bytes from an earlier cancel must not end this startup's wait; a
+        # cancel sent from here on is kept until wait_for_server reads it
+        self._drain_startup_wakeup()
+        self._startup_cancelled.clear()
         thread = threading.Thread(target=self.run_agent)
         thread.daemon = True
         thread.start()
 
     def run_agent(self):
         try:
-            logger.info(f"Starting RPA agent for {self.doctor_data.get('username')}")
+            logger.info("Starting RPA agent for %s", self.doctor_data.get("username"))
+
+            # Start the local server first so it binds while the tunnel
+            # configuration is downloading; both are independent
+            self.start_fastapi_server()
 
             # Update UI - Downloading tunnel configuration
-            self.after(
-                0,
-                lambda: self.update_status_message(
-                    "Downloading tunnel configuration..."
-                ),
-            )
-            self.after(0, lambda: self.update_idletasks())
+            self._ui(self.update_status_message, "Downloading tunnel configuration...")
 
             result = self.fetch_tunnel_config()
 
             if not result["success"]:
                 error_msg = result["error"]
-                logger.error(f"Failed to fetch tunnel config: {error_msg}")
+                logger.error("Failed to fetch tunnel config: %s", error_msg)
                 raise Exception(error_msg)
 
             tunnel_name = result.get("tunnel_name")
-            logger.info(f"Tunnel config fetched: {tunnel_name}")
+            logger.info("Tunnel config fetched: %s", tunnel_name)
 
             # Update UI - Starting local server
-            self.after(
-                0, lambda: self.update_status_message("Starting local server...")
-            )
-            self.after(0, lambda: self.update_idletasks())
+            self._ui(self.update_status_message, "Starting local server...")
 
-            self.start_fastapi_server()
-
-            if not self.wait_for_server(max_attempts=15, delay=1):
+            if not self.wait_for_server(timeout=15):
+                if self._abort_if_cancelled():
+                    return
                 error_msg = "The local server could not be started"
                 logger.error(error_msg)
                 raise Exception(error_msg)
 
             logger.info("FastAPI server started")
+            if self._abort_if_cancelled():
+                return
 
             # Update UI - Connecting to system
-            self.after(0, lambda: self.update_status_message("Connecting to system..."))
-            self.after(0, lambda: self.update_idletasks())
+            self._ui(self.update_status_message, "Connecting to system...")
 
             if not self.tunnel_manager.start_tunnel(tunnel_name):
                 logger.error("Failed to start tunnel")
                 raise Exception("Could not start connection tunnel")
 
             logger.info("Tunnel started successfully")
-            time.sleep(2)
+            if not self.tunnel_manager.wait_ready(timeout=10):
+                logger.warning("Tunnel connection not confirmed yet - continuing")
+            if self._abort_if_cancelled():
+                return
 
             # Update UI - Completed
-            self.after(0, lambda: self.update_status_display(True))
-            self.after(0, lambda: self.toggle_button.configure(state="normal"))
-            self.after(0, lambda: self.update_idletasks())
+            self._ui(self._on_agent_started)
 
             print(f"\nRPA Agent accessible at: {self.doctor_data.get('rpaUrl')}")
 
@@ -497,28 +659,61 @@ class RPAApplication(ctk.CTk):
             start_lobby_service(interval_seconds=3600)
             logger.info("Lobby verification service started")
 
-            # Send initial heartbeat and start heartbeat thread
-            self.after(0, lambda: self.send_heartbeat())
-            self.after(0, lambda: self.start_heartbeat_thread())
+            # Heartbeat thread sends the initial heartbeat right away
+            self.start_heartbeat_thread()
+
+            # A stop that ran while these were starting had nothing to stop
+            self._abort_if_cancelled()
 
         except Exception as e:
+            if self._abort_if_cancelled():
+                return
             error_msg = str(e)
-            logger.error(f"Agent startup failed: {error_msg}", exc_info=True)
-            self.after(
-                0, lambda err=error_msg: self.update_status_message(f"Error: {err}")
-            )
-            self.after(
-                0, lambda err=error_msg: messagebox.showerror("Startup Error", err)
-            )
-            self.after(0, self.reset_agent_state)
+            logger.error("Agent startup failed: %s", error_msg, exc_info=True)
+            self._stop_fastapi_server()
+            self._ui(self._on_agent_start_failed, error_msg)
+
+    def _abort_if_cancelled(self):
+        """
+        If stop_agent cancelled this startup, tear down whatever run_agent
+        started after that stop had already run.
+
+        Returns:
+            True if the startup was cancelled
+        """
+        if not self._startup_cancelled.is_set():
+            return False
+
+        logger.info("Agent startup cancelled - releasing started resources")
+        self._stop_heartbeat()
+        stop_lobby_service()
+        try:
+            self.tunnel_manager.stop_tunnel()
+        except Exception as e:
+            logger.error("Error stopping tunnel: %s", e)
+        self._stop_fastapi_server()
+        return True
+
+    def _on_agent_started(self):
+        """Main-thread UI updates once startup completes (one Tk event)."""
+        if self._startup_cancelled.is_set():
+            return  # stop_agent already reset the UI
+        self.update_status_display(True)
+        self.toggle_button.configure(state="normal")
+
+    def _on_agent_start_failed(self, error_msg):
+        """Main-thread UI updates after a failed startup (one Tk event)."""
+        self.update_status_message(f"Error: {error_msg}")
+        messagebox.showerror("Startup Error", error_msg)
+        self.reset_agent_state()
 
     def fetch_tunnel_config(self):
         try:
             logger.info(
-                f"Fetching tunnel config for {self.doctor_data.get('username')}"
+                "Fetching tunnel config for %s", self.doctor_data.get("username")
             )
 
-            response = requests.post(
+            response = self._http.post(
                 f"{config.BACKEND_URL}/doctors/rpa-config",
                 json={
                     "username": self.doctor_data.get("username"),
@@ -528,7 +723,7 @@ class RPAApplication(ctk.CTk):
             )
 
             if response.status_code not in [200, 201]:
-                logger.error(f"Bad response status: {response.status_code}")
+                logger.error("Bad response status: %s", response.status_code)
                 return {
                     "success": False,
                     "error": f"Failed to fetch tunnel config (Status: {response.status_code})",
@@ -546,7 +741,7 @@ class RPAApplication(ctk.CTk):
             credentials = tunnel_info.get("credentials")
             config_data = tunnel_info.get("config")
 
-            logger.info(f"Tunnel: {tunnel_name} (ID: {tunnel_id})")
+            logger.info("Tunnel: %s (ID: %s)", tunnel_name, tunnel_id)
 
             if not self.tunnel_manager.save_tunnel_credentials(tunnel_id, credentials):
                 logger.error("Failed to save tunnel credentials")
@@ -561,80 +756,206 @@ class RPAApplication(ctk.CTk):
             return {"success": True, "tunnel_id": tunnel_id, "tunnel_name": tunnel_name}
 
         except Exception as e:
-            logger.error(f"Exception in fetch_tunnel_config: {str(e)}", exc_info=True)
+            logger.error("Exception in fetch_tunnel_config: %s", e, exc_info=True)
             return {"success": False, "error": str(e)}
 
     def start_fastapi_server(self):
+        # A previous server must release port 8000 before a new one binds
+        self._stop_fastapi_server()
+
+        self._server_ready.clear()
+        server_ready = self._server_ready
+        stop_requested = self._server_stop_requested = threading.Event()
+
         def run_server():
             try:
+                import uvicorn
                 import app
 
-                uvicorn.run(
+                class ReadyServer(uvicorn.Server):
+                    """Signals the GUI once the listening socket is bound."""
+
+                    async def startup(self, sockets=None):
+                        await super().startup(sockets=sockets)
+                        if self.started:
+                            server_ready.set()
+
+                # uvloop has no Windows build; httptools works everywhere
+                loop = "asyncio" if platform.system() == "Windows" else "uvloop"
+                server_config = uvicorn.Config(
                     app.app,
                     host="0.0.0.0",
                     port=8000,
+                    loop=loop,
+                    http="httptools",
+                    workers=1,
+                    timeout_keep_alive=15,
                     log_config=None,
                     access_log=False,
                 )
+                server = ReadyServer(server_config)
+                self._uv_server = server
+                # Assigned before this check, so a concurrent stop either
+                # sees the server or is seen here
+                if stop_requested.is_set():
+                    return
+                server.run()
             except Exception as e:
-                logger.error(f"Failed to start FastAPI server: {e}", exc_info=True)
+                logger.error("Failed to start FastAPI server: %s", e, exc_info=True)
 
-        server_thread = threading.Thread(target=run_server, daemon=True)
-        server_thread.start()
+        self._server_thread = threading.Thread(target=run_server, daemon=True)
+        self._server_thread.start()
         logger.info("FastAPI server thread started")
 
-    def wait_for_server(self, max_attempts=10, delay=1):
-        import socket
+    def _request_server_stop(self):
+        """
+        Ask the local server to shut down without waiting for it (safe on the
+        Tk thread). The next start_fastapi_server waits for the old thread.
+        """
+        self._server_stop_requested.set()
+        if self._uv_server is not None:
+            self._uv_server.should_exit = True
+
+    def _stop_fastapi_server(self, timeout=5):
+        """
+        Shut down the local server and wait for its thread to finish, so the
+        next start can bind the port again.
+        """
+        thread = self._server_thread
+        if thread is None:
+            return
 
-        for attempt in range(max_attempts):
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(1)
-                result = sock.connect_ex(("localhost", 8000))
-                sock.close()
+        self._request_server_stop()
+        thread.join(timeout=timeout)
+        if thread.is_alive():
+            logger.warning("Local server did not stop within %ss", timeout)
+        else:
+            logger.info("Local server stopped")
+
+        self._uv_server = None
+        self._server_thread = None
+
+    def wait_for_server(self, timeout=15):
+        """
+        Wait until the local server is accepting connections.
+
+        A single selector waits on a non-blocking connect to the port and on
+        the startup wakeup socket, so stop_agent can cancel the wait at once.
+        Refused connects are retried with backoff (25ms up to 500ms).
 
-                if result == 0:
+        Returns:
+            True when the server is ready; False on timeout, failure or cancel
+        """
+        self._drain_startup_wakeup()
+
+        delay = 0.025
+        deadline = time.monotonic() + timeout
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._startup_wakeup_r, selectors.EVENT_READ)
+
+            while (remaining := deadline - time.monotonic()) > 0:
+                if self._server_ready.is_set():
                     logger.info("FastAPI server is ready")
                     return True
-                else:
-                    time.sleep(delay)
-            except Exception as e:
-                logger.warning(f"Error checking server: {e}")
-                time.sleep(delay)
+
+                if self._server_thread and not self._server_thread.is_alive():
+                    break
+
+                wait_s = min(delay, remaining)
+                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                    sock.setblocking(False)
+                    sock.connect_ex(("127.0.0.1", 8000))
+                    selector.register(sock, selectors.EVENT_WRITE)
+                    try:
+                        events = selector.select(wait_s)
+                    finally:
+                        selector.unregister(sock)
+
+                    for key, _ in events:
+                        if key.fileobj is self._startup_wakeup_r:
+                            logger.info("Waiting for local server cancelled")
+                            return False
+                    if (
+                        events
+                        and sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+                    ):
+                        logger.info("FastAPI server is ready")
+                        return True
+
+                # Connect was refused right away: back off, still cancellable
+                if events and selector.select(wait_s):
+                    logger.info("Waiting for local server cancelled")
+                    return False
+
+                delay = min(delay * 1.7, 0.5)
 
         logger.error("FastAPI server failed to start")
         return False
 
-    def send_heartbeat(self):
+    def _drain_startup_wakeup(self):
+        """Discard wakeup bytes left over from an earlier cancel."""
         try:
-            doctor_id = self.doctor_data.get("id")
-            if not doctor_id:
-                return
+            while self._startup_wakeup_r.recv(64):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _cancel_startup(self):
+        """Interrupt a startup that is waiting for the local server."""
+        self._startup_cancelled.set()
+        try:
+            self._startup_wakeup_w.send(b"\0")
+        except OSError:
+            pass
 
-            response = requests.post(
-                f"{config.BACKEND_URL}/doctors/{doctor_id}/heartbeat", timeout=5
+    def send_heartbeat(self, doctor_id):
+        try:
+            # (connect, read) timeouts keep a lost packet from stalling the loop
+            response = self._http.post(
+                f"{config.BACKEND_URL}/doctors/{doctor_id}/heartbeat",
+                timeout=(1.0, 2.0),
             )
 
             if response.status_code in [200, 201]:
                 logger.info("Heartbeat sent")
             else:
-                logger.warning(f"Heartbeat failed: {response.status_code}")
+                logger.warning("Heartbeat failed: %s", response.status_code)
         except Exception as e:
-            logger.error(f"Error sending heartbeat: {e}")
+            logger.error("Error sending heartbeat: %s", e)
 
     def start_heartbeat_thread(self):
-        self.should_heartbeat = True
-        heartbeat_interval = config.get_rpa_setting("heartbeat_interval_seconds", 300)
+        doctor_id = self.doctor_data.get("id")
+        if not doctor_id:
+            logger.warning("No doctor ID - heartbeat disabled")
+            return
 
-        def heartbeat_loop():
-            while self.should_heartbeat and self.agent_running:
-                time.sleep(heartbeat_interval)
-                if self.should_heartbeat and self.agent_running:
-                    self.send_heartbeat()
+        self._stop_heartbeat()
+        if self._startup_cancelled.is_set():
+            return
+
+        task = None
 
-        self.heartbeat_thread = threading.Thread(target=heartbeat_loop, daemon=True)
-        self.heartbeat_thread.start()
-        logger.info(f"Heartbeat thread started (every {heartbeat_interval}s)")
+        def heartbeat():
+            # Like the old loop's `while agent_running`: a task that outlived
+            # stop_agent (or was scheduled after it) ends itself
+            if not self.agent_running or self._startup_cancelled.is_set():
+                if task is not None:
+                    task.cancel()
+                return
+            self.send_heartbeat(doctor_id)
+
+        heartbeat_interval = config.get_rpa_setting("heartbeat_interval_seconds", 300)
+        # Timed by the shared service scheduler and sent from its worker pool
+        # (the request can block); the first heartbeat goes out right away
+        task = self._heartbeat_task = schedule_periodic(
+            heartbeat_interval, heartbeat, delay=0, blocking=True
+        )
+        logger.info("Heartbeat scheduled (every %ss)", heartbeat_interval)
+
+    def _stop_heartbeat(self):
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
 
     def stop_agent(self):
         if not self.agent_running:
@@ -643,7 +964,8 @@ class RPAApplication(ctk.CTk):
         self.update_status_message("Stopping assistant...")
         self.toggle_button.configure(state="disabled", text="Stopping...")
 
-        self.should_heartbeat = False
+        self._cancel_startup()
+        self._stop_heartbeat()
 
         # Stop lobby verification service
         stop_lobby_service()
@@ -655,9 +977,10 @@ class RPAApplication(ctk.CTk):
             self.tunnel_manager.stop_tunnel()
             logger.info("Tunnel stopped")
         except Exception as e:
-            logger.error(f"Error stopping tunnel: {e}")
+            logger.error("Error stopping tunnel: %s", e)
 
-        logger.info("Server will continue running (restart required to stop)")
+        # Not joined here: this runs on the Tk thread
+        self._request_server_stop()
 
         self.reset_agent_state()
         self.update_status_message("The assistant is off.")
@@ -682,21 +1005,22 @@ class RPAApplication(ctk.CTk):
         self.show_login_screen()
 
     def on_closing(self):
+        if platform.system() == "Windows":
+            self._close_autostart_key()
+
         if self.agent_running:
             response = messagebox.askyesno(
                 "Exit", "The assistant is active. Do you want to stop it and exit?"
             )
             if response:
                 self.stop_agent()
-                # Give time for tunnel to stop
-                time.sleep(1)
                 self.destroy()
         else:
             # Ensure tunnel is stopped even if agent_running is False
             try:
                 self.tunnel_manager.stop_tunnel()
             except Exception as e:
-                logger.error(f"Error stopping tunnel on close: {e}")
+                logger.error("Error stopping tunnel on close: %s", e)
             self.destroy()
 
 
@@ -2,16 +2,112 @@
 Logging system for RPA Agent
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
 import tempfile
 from pathlib import Path
 from datetime import datetime
 
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+LOG_FILE_NAME = "rpa.log"
+LOG_MAX_BYTES = 5_000_000
+LOG_BACKUP_COUNT = 5
+
+# Lock on LOG_FILE_NAME held for the life of the process that owns it
+_log_lock = None
+
+
+def _claim_log_file(logs_dir: Path) -> Path:
+    """
+    Pick this process's log file in logs_dir.
+
+    Only one process may rotate rpa.log (on Windows a rollover fails while
+    another process has the file open), so the first process takes an
+    exclusive lock on it. Any other instance, e.g. a manual launch next to
+    the autostarted agent, logs to its own rpa_<pid>.log instead.
+    """
+    global _log_lock
+    if _log_lock is not None:
+        return logs_dir / LOG_FILE_NAME
+
+    lock_file = open(logs_dir / f"{LOG_FILE_NAME}.lock", "a+b")
+    try:
+        if sys.platform == "win32":
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return logs_dir / f"rpa_{os.getpid()}.log"
+
+    _log_lock = lock_file
+    return logs_dir / LOG_FILE_NAME
+
+
+def _open_log_file(log_file: Path, formatter: logging.Formatter):
+    """
+    Rotating file handler: keeps the log plus LOG_BACKUP_COUNT backups of
+    LOG_MAX_BYTES each. Installed (frozen) builds only write INFO and above.
+    """
+    file_handler = RotatingFileHandler(
+        log_file,
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+    frozen = getattr(sys, "frozen", False)
+    file_handler.setLevel(logging.INFO if frozen else logging.DEBUG)
+    file_handler.setFormatter(formatter)
+    return file_handler
+
+
+def _create_file_handler(formatter: logging.Formatter):
+    """
+    Create the log file handler in the app logs directory, falling back to
+    the temp directory.
+
+    Returns:
+        Tuple of (handler or None, log file path or None, AppData error or None)
+    """
+    try:
+        from config import config
+
+        logs_dir = config.get_logs_dir()
+        logs_dir.mkdir(parents=True, exist_ok=True)
+        log_file = _claim_log_file(logs_dir)
+        file_handler = _open_log_file(log_file, formatter)
+        return file_handler, log_file, None
+
+    except Exception as e:
+        # Fallback to temp directory
+        try:
+            temp_dir = Path(tempfile.gettempdir()) / "HannaMedRPA"
+            temp_dir.mkdir(parents=True, exist_ok=True)
+            log_file = _claim_log_file(temp_dir)
+            file_handler = _open_log_file(log_file, formatter)
+            return file_handler, log_file, e
+
+        except Exception:
+            return None, None, e
+
 
 def setup_logger(name: str = "RPA") -> logging.Logger:
-    """Setup logger with file and console handlers"""
+    """
+    Setup logger with file and console handlers.
+
+    Callers only enqueue records; a QueueListener thread does the formatting
+    and console/file writes, so logging never blocks on disk I/O. The
+    listener is stored as `logger.listener` and stopped at exit.
+    """
 
     logger = logging.getLogger(name)
     logger.setLevel(logging.DEBUG)
@@ -25,56 +121,38 @@ def setup_logger(name: str = "RPA") -> logging.Logger:
     console_handler.setLevel(logging.DEBUG)
     console_formatter = logging.Formatter("%(asctime)s - %(levelname)s: %(message)s")
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # Setup file logging
-    try:
+    file_formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    file_handler, log_file, appdata_error = _create_file_handler(file_formatter)
+    if file_handler is not None:
+        handlers.append(file_handler)
+
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    logger.listener = listener
+    atexit.register(listener.stop)
+
+    if file_handler is None:
+        logger.warning("Running without file logging - console only")
+    elif appdata_error is not None:
+        logger.warning(f"Using temporary log file: {log_file}")
+        logger.error(f"Failed to create log in AppData: {appdata_error}")
+    else:
         from config import config
 
-        logs_dir = config.get_logs_dir()
-        logs_dir.mkdir(parents=True, exist_ok=True)
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = logs_dir / f"rpa_{timestamp}.log"
-
-        file_handler = logging.FileHandler(log_file, encoding="utf-8")
-        file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
-
         logger.info("=" * 60)
         logger.info(f"RPA Agent Log Started - {datetime.now()}")
         logger.info(f"Log file: {log_file}")
         logger.info(f"Backend URL: {config.BACKEND_URL}")
         logger.info("=" * 60)
 
-    except Exception as e:
-        # Fallback to temp directory
-        try:
-            temp_dir = Path(tempfile.gettempdir()) / "HannaMedRPA"
-            temp_dir.mkdir(parents=True, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            log_file = temp_dir / f"rpa_{timestamp}.log"
-
-            file_handler = logging.FileHandler(log_file, encoding="utf-8")
-            file_handler.setLevel(logging.DEBUG)
-            file_formatter = logging.Formatter(
-                "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-                datefmt="%Y-%m-%d %H:%M:%S",
-            )
-            file_handler.setFormatter(file_formatter)
-            logger.addHandler(file_handler)
-
-            logger.warning(f"Using temporary log file: {log_file}")
-            logger.error(f"Failed to create log in AppData: {e}")
-
-        except Exception as e2:
-            logger.warning("Running without file logging - console only")
-
     return logger
 
 
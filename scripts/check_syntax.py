@@ -4,19 +4,67 @@ Pre-build syntax checker for Python files.
 Runs before PyInstaller to catch syntax errors early.
 """
 
+import importlib.util
+import os
 import sys
 import py_compile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
+
+# Directories never worth checking (build output, environments, VCS)
+DEFAULT_EXCLUDE_DIRS = frozenset(
+    {
+        "__pycache__",
+        ".venv",
+        "venv",
+        "build",
+        "dist",
+        ".git",
+        "installer",
+    }
+)
+
+
+def has_fresh_bytecode(filepath: Path) -> bool:
+    """
+    Check whether the cached .pyc was compiled from the current source.
+
+    Uses the same test as the import system: the pyc header must carry this
+    interpreter's magic number and the source's mtime and size.
+    """
+    try:
+        cached = importlib.util.cache_from_source(str(filepath))
+        with open(cached, "rb") as f:
+            header = f.read(16)
+        stat = os.stat(filepath)
+    except (OSError, NotImplementedError, ValueError):
+        return False
+
+    if len(header) < 16 or header[:4] != importlib.util.MAGIC_NUMBER:
+        return False
+    # Only timestamp-based pycs (flags == 0) record mtime and size
+    flags = int.from_bytes(header[4:8], "little")
+    mtime = int.from_bytes(header[8:12], "little")
+    size = int.from_bytes(header[12:16], "little")
+    return (
+        flags == 0
+        and mtime == int(stat.st_mtime) & 0xFFFFFFFF
+        and size == stat.st_size & 0xFFFFFFFF
+    )
 
 
 def check_file(filepath: Path) -> Tuple[bool, str]:
     """
     Check a single Python file for syntax errors.
+    Files whose cached bytecode is up to date compiled cleanly last time,
+    so they are skipped.
 
     Returns:
         (success, error_message)
     """
+    if has_fresh_bytecode(filepath):
+        return True, ""
     try:
         py_compile.compile(str(filepath), doraise=True)
         return True, ""
@@ -26,38 +74,45 @@ def check_file(filepath: Path) -> Tuple[bool, str]:
         return False, f"Unexpected error: {e}"
 
 
+def collect_python_files(directory: Path, exclude_dirs: Iterable[str]) -> List[Path]:
+    """
+    Find all Python files under a directory.
+    Excluded directories are pruned during the walk, so they are never listed.
+    """
+    # No copy when given a frozenset (e.g. DEFAULT_EXCLUDE_DIRS)
+    exclude_set = frozenset(exclude_dirs)
+    files = []
+    for root, dirs, filenames in os.walk(directory):
+        dirs[:] = [d for d in dirs if d not in exclude_set]
+        for filename in filenames:
+            if filename.endswith(".py"):
+                files.append(Path(root) / filename)
+    return files
+
+
 def check_directory(
-    directory: Path, exclude_dirs: List[str] = None
-) -> List[Tuple[Path, str]]:
+    directory: Path, exclude_dirs: Iterable[str] = None
+) -> Tuple[List[Path], List[Tuple[Path, str]]]:
     """
     Check all Python files in a directory recursively.
 
     Returns:
-        List of (filepath, error_message) for files with errors
+        (checked files, list of (filepath, error_message) for files with errors)
     """
     if exclude_dirs is None:
-        exclude_dirs = [
-            "__pycache__",
-            ".venv",
-            "venv",
-            "build",
-            "dist",
-            ".git",
-            "installer",
-        ]
+        exclude_dirs = DEFAULT_EXCLUDE_DIRS
 
-    errors = []
-
-    for py_file in directory.rglob("*.py"):
-        # Skip excluded directories
-        if any(excluded in py_file.parts for excluded in exclude_dirs):
-            continue
+    files = collect_python_files(directory, exclude_dirs)
 
-        success, error = check_file(py_file)
-        if not success:
-            errors.append((py_file, error))
+    # Compiling is CPU-bound, so spread the files over all cores
+    errors = []
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(check_file, files, chunksize=32)
+        for py_file, (success, error) in zip(files, results):
+            if not success:
+                errors.append((py_file, error))
 
-    return errors
+    return files, errors
 
 
 def main():
@@ -73,7 +128,7 @@ def main():
     print()
 
     # Check all Python files
-    errors = check_directory(project_root)
+    files, errors = check_directory(project_root)
 
     if errors:
         print(f"❌ FOUND {len(errors)} SYNTAX ERROR(S):")
@@ -88,24 +143,7 @@ def main():
         print("=" * 60)
         sys.exit(1)
     else:
-        # Count checked files
-        checked = sum(
-            1
-            for _ in project_root.rglob("*.py")
-            if not any(
-                x in _.parts
-                for x in [
-                    "__pycache__",
-                    ".venv",
-                    "venv",
-                    "build",
-                    "dist",
-                    ".git",
-                    "installer",
-                ]
-            )
-        )
-        print(f"✅ All {checked} Python files passed syntax check!")
+        print(f"✅ All {len(files)} Python files passed syntax check!")
         print("=" * 60)
         sys.exit(0)
 
@@ -1,31 +1,56 @@
 """
 Services module - Business logic for GUI.
+
+Names are imported on first access (PEP 562), so e.g. the login screen can
+use AuthService without loading uvicorn, FastAPI or the screen-automation
+stack behind the agent and watcher services.
 """
 
-from .auth_service import AuthService
-from .agent_service import AgentService
-from services.lobby_service import (
-    LobbyVerificationService,
-    get_lobby_service,
-    start_lobby_service,
-    stop_lobby_service,
-)
-from services.modal_watcher_service import (
-    ModalWatcherService,
-    get_modal_watcher,
-    start_modal_watcher,
-    stop_modal_watcher,
-)
-
-__all__ = [
-    "AuthService",
-    "AgentService",
-    "LobbyVerificationService",
-    "get_lobby_service",
-    "start_lobby_service",
-    "stop_lobby_service",
-    "ModalWatcherService",
-    "get_modal_watcher",
-    "start_modal_watcher",
-    "stop_modal_watcher",
-]
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .agent_service import AgentService
+    from .auth_service import AuthService
+    from .lobby_service import (
+        LobbyVerificationService,
+        get_lobby_service,
+        start_lobby_service,
+        stop_lobby_service,
+    )
+    from .modal_watcher_service import (
+        ModalWatcherService,
+        get_modal_watcher,
+        start_modal_watcher,
+        stop_modal_watcher,
+    )
+
+# Public name -> submodule that defines it
+_LAZY = {
+    "AuthService": ".auth_service",
+    "AgentService": ".agent_service",
+    "LobbyVerificationService": ".lobby_service",
+    "get_lobby_service": ".lobby_service",
+    "start_lobby_service": ".lobby_service",
+    "stop_lobby_service": ".lobby_service",
+    "ModalWatcherService": ".modal_watcher_service",
+    "get_modal_watcher": ".modal_watcher_service",
+    "start_modal_watcher": ".modal_watcher_service",
+    "stop_modal_watcher": ".modal_watcher_service",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -7,22 +7,28 @@ import threading
 import time
 from typing import Optional, Callable
 
-import requests
-import uvicorn
-
 from config import config
 from logger import logger
-from tunnel_manager import TunnelManager
+
+from .http_session import create_session
+from .scheduler import PeriodicTask, schedule_periodic
 
 
 class AgentService:
     """Manages the RPA agent lifecycle including server and tunnel."""
 
     def __init__(self):
+        # Imported here so importing the services package stays cheap
+        from tunnel_manager import TunnelManager
+
         self.tunnel_manager = TunnelManager()
         self.running = False
-        self.heartbeat_thread: Optional[threading.Thread] = None
-        self.should_heartbeat = False
+        self._heartbeat_task: Optional[PeriodicTask] = None
+        self._session = create_session()
+        # Set by the server thread once uvicorn is listening (or has failed)
+        self._server_ready = threading.Event()
+        self._server_error: Optional[str] = None
+        self._server_thread: Optional[threading.Thread] = None
 
     def start_server(self, on_error: Optional[Callable[[str], None]] = None):
         """
@@ -31,57 +37,104 @@ class AgentService:
         Args:
             on_error: Optional callback for error handling
         """
+        self._server_ready.clear()
+        self._server_error = None
+        server_ready = self._server_ready
 
         def run_server():
             try:
+                # uvicorn and the API pull in FastAPI; load them on this
+                # thread only when the server is actually started
+                import uvicorn
                 from api import app
 
-                uvicorn.run(
-                    app,
-                    host="0.0.0.0",
-                    port=8000,
-                    log_config=None,
-                    access_log=False,
+                class ReadyServer(uvicorn.Server):
+                    """Signals server_ready once the listening socket is bound."""
+
+                    async def startup(self, sockets=None):
+                        await super().startup(sockets=sockets)
+                        if self.started:
+                            server_ready.set()
+
+                server = ReadyServer(
+                    uvicorn.Config(
+                        app,
+                        host="0.0.0.0",
+                        port=8000,
+                        log_config=None,
+                        access_log=False,
+                    )
                 )
+                server.run()
             except Exception as e:
                 logger.error(f"Failed to start FastAPI server: {e}", exc_info=True)
+                self._server_error = str(e)
                 if on_error:
                     on_error(str(e))
-
-        server_thread = threading.Thread(target=run_server, daemon=True)
-        server_thread.start()
+            finally:
+                # Never leave wait_for_server blocked on a server that is gone
+                # (uvicorn exits via SystemExit when the port cannot be bound)
+                if not server_ready.is_set():
+                    self._server_error = self._server_error or "Server exited"
+                    server_ready.set()
+
+        self._server_thread = threading.Thread(target=run_server, daemon=True)
+        self._server_thread.start()
         logger.info("FastAPI server thread started")
 
     def wait_for_server(self, max_attempts: int = 10, delay: float = 1) -> bool:
         """
         Wait for the server to be ready.
 
+        Blocks on the readiness event set by the server thread, so this returns
+        as soon as uvicorn is listening rather than on the next poll. If the
+        server was not started by this service, the port is probed instead.
+
         Args:
-            max_attempts: Maximum number of connection attempts
-            delay: Delay between attempts in seconds
+            max_attempts: Together with delay, bounds the total wait
+                          (max_attempts * delay seconds)
+            delay: Seconds per attempt
 
         Returns:
             True if server is ready, False otherwise
         """
-        for attempt in range(max_attempts):
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(1)
-                result = sock.connect_ex(("localhost", 8000))
-                sock.close()
-
-                if result == 0:
-                    logger.info("FastAPI server is ready")
-                    return True
-                else:
-                    time.sleep(delay)
-            except Exception as e:
-                logger.warning(f"Error checking server: {e}")
-                time.sleep(delay)
+        timeout = max_attempts * delay
+        if self._server_thread is None:
+            ready = self._probe_server(timeout)
+        else:
+            ready = self._server_ready.wait(timeout=timeout) and (
+                self._server_error is None
+            )
+        if ready:
+            logger.info("FastAPI server is ready")
+            return True
 
         logger.error("FastAPI server failed to start")
         return False
 
+    @staticmethod
+    def _probe_server(timeout: float) -> bool:
+        """
+        Poll the local port until it accepts a connection.
+
+        Backs off from 50ms to 1s, so a server that is already up is detected
+        on the first attempt.
+        """
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while True:
+            try:
+                # Literal address skips name resolution
+                with socket.create_connection(("127.0.0.1", 8000), timeout=0.2):
+                    return True
+            except OSError:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(0.05 * (2**attempt), 1.0, remaining))
+            attempt += 1
+
     def start_tunnel(
         self,
         tunnel_id: str,
@@ -138,7 +191,7 @@ class AgentService:
             if not doctor_id:
                 return
 
-            response = requests.post(
+            response = self._session.post(
                 f"{config.BACKEND_URL}/doctors/{doctor_id}/heartbeat",
                 timeout=5,
             )
@@ -152,27 +205,24 @@ class AgentService:
 
     def start_heartbeat(self, doctor_id: str):
         """
-        Start the heartbeat thread.
+        Schedule periodic heartbeats with the shared service scheduler.
 
         Args:
             doctor_id: Doctor's ID
         """
-        self.should_heartbeat = True
+        self.stop_heartbeat()
         heartbeat_interval = config.get_rpa_setting("heartbeat_interval_seconds", 300)
-
-        def heartbeat_loop():
-            while self.should_heartbeat and self.running:
-                time.sleep(heartbeat_interval)
-                if self.should_heartbeat and self.running:
-                    self.send_heartbeat(doctor_id)
-
-        self.heartbeat_thread = threading.Thread(target=heartbeat_loop, daemon=True)
-        self.heartbeat_thread.start()
-        logger.info(f"Heartbeat thread started (every {heartbeat_interval}s)")
+        # The request can block, so it runs on the scheduler's worker pool
+        self._heartbeat_task = schedule_periodic(
+            heartbeat_interval, lambda: self.send_heartbeat(doctor_id), blocking=True
+        )
+        logger.info(f"Heartbeat scheduled (every {heartbeat_interval}s)")
 
     def stop_heartbeat(self):
-        """Stop the heartbeat thread."""
-        self.should_heartbeat = False
+        """Stop sending heartbeats."""
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
 
     def start(
         self,
@@ -223,4 +273,5 @@ class AgentService:
         self.running = False
         self.stop_heartbeat()
         self.stop_tunnel()
+        self._session.close()
         logger.info("Agent stopped")
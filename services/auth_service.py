@@ -8,12 +8,15 @@ from typing import Optional, Dict, Any
 from config import config
 from logger import logger
 
+from .http_session import create_session
+
 
 class AuthService:
     """Handles authentication with the backend."""
 
     def __init__(self):
         self.backend_url = config.BACKEND_URL
+        self._session = create_session()
 
     def login(self, username: str, password: str) -> Dict[str, Any]:
         """
@@ -27,7 +30,7 @@ class AuthService:
             Dict with 'success' boolean and either 'doctor' data or 'error' message
         """
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.backend_url}/auth/doctor-login",
                 json={"username": username, "password": password},
                 timeout=10,
@@ -70,7 +73,7 @@ class AuthService:
         try:
             logger.info(f"Fetching tunnel config for {username}")
 
-            response = requests.post(
+            response = self._session.post(
                 f"{self.backend_url}/doctors/rpa-config",
                 json={"username": username, "password": password},
                 timeout=30,
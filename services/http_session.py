@@ -0,0 +1,40 @@
+"""
+HTTP session factory for backend calls.
+A pooled session keeps the TCP/TLS connection to the backend alive between
+requests (heartbeats, login, tunnel config) instead of reconnecting each time.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_session(
+    retries: int = 2, backoff_factor: float = 0.3, status_forcelist=None
+) -> requests.Session:
+    """
+    Create a requests.Session with a small connection pool.
+
+    Args:
+        retries: Retries for connection errors (POSTs are not replayed on
+            read errors, so requests are never sent twice)
+        backoff_factor: Backoff between retries in seconds
+        status_forcelist: HTTP statuses that also trigger a retry (only for
+            idempotent methods such as GET)
+
+    Returns:
+        Configured session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=4,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -1,23 +1,28 @@
 """
-Modal Watcher Service - Background thread that monitors and dismisses unexpected modals.
+Modal Watcher Service - Background job that monitors and dismisses unexpected modals.
 
 This service handles modals that can appear at any time during flow execution,
 such as Jackson's OK modal, without interrupting the main flow logic.
 """
 
-import threading
 import time
 
-import pyautogui
+import cv2
+import numpy as np
+from pyscreeze import Box
 
 from config import config
+from core.template_cache import get_template, load_template
 from logger import logger
 
+from .scheduler import schedule_once, schedule_periodic
+
 
 class ModalWatcherService:
     """
     Service that monitors for unexpected modals during flow execution.
-    Runs in a background thread and automatically dismisses modals when detected.
+    Runs on the shared service scheduler and automatically dismisses modals when
+    detected.
 
     Similar to robust_wait_for_element but operates at the flow execution level
     rather than individual step level.
@@ -26,6 +31,19 @@ class ModalWatcherService:
     # Default check interval in seconds
     DEFAULT_CHECK_INTERVAL = 2.0
 
+    # Coarse pass: match at 1/COARSE_SCALE resolution and only run the
+    # full-resolution match near a coarse hit above COARSE_CONFIDENCE
+    COARSE_SCALE = 4
+    COARSE_CONFIDENCE = 0.7
+    # Templates smaller than this (in pixels, after downscaling) skip the
+    # coarse pass, since they carry too little detail to match reliably
+    COARSE_MIN_SIZE = 6
+
+    # Jackson OK modal: seconds before the second click, and after it before
+    # the watcher looks at the screen again
+    OK_MODAL_SECOND_CLICK_DELAY = 2.0
+    OK_MODAL_SETTLE_DELAY = 1.0
+
     def __init__(self, check_interval: float = None):
         """
         Initialize the modal watcher service.
@@ -35,13 +53,25 @@ class ModalWatcherService:
                            Lower = more responsive but higher CPU usage.
         """
         self.check_interval = check_interval or self.DEFAULT_CHECK_INTERVAL
-        self._stop_event = threading.Event()
-        self._thread = None
+        self._task = None
         self._confidence = config.get_rpa_setting("confidence", 0.8)
 
         # Registry of modals to watch for
-        # Format: {modal_key: (image_path, handler_func, description)}
+        # Format: {modal_key: (image_path, templates, handler_func, description)}
+        # templates is a (full, coarse) pair of grayscale arrays decoded once at
+        # registration, so each tick only pays for the screen grab and the match.
         self._modal_handlers = {}
+        # Immutable snapshot of the matchable entries as
+        # (templates, handler, description), iterated on every tick
+        self._handlers_tuple = ()
+
+        # Downsampled copy of the last screen with no modal on it; an identical
+        # screen on the next tick cannot contain a modal either.
+        self._last_thumbnail = None
+
+        # Ticks are skipped until this monotonic time while a dismissal is
+        # still in progress (its follow-up steps are scheduled, not slept)
+        self._paused_until = 0.0
 
         # Register default modals
         self._register_default_modals()
@@ -70,38 +100,163 @@ class ModalWatcherService:
             handler: Function to call when modal is detected (receives location)
             description: Human-readable description for logging
         """
-        self._modal_handlers[key] = (image_path, handler, description)
+        templates = self._load_gray_templates(image_path)
+        self._modal_handlers[key] = (image_path, templates, handler, description)
+        self._rebuild_handlers_tuple()
         logger.debug(f"[MODAL WATCHER] Registered modal: {description}")
 
+    def _load_gray_templates(self, image_path: str):
+        """
+        Decode a template as grayscale at full and coarse resolution.
+
+        Returns:
+            (full, coarse) arrays (coarse may be None for tiny templates),
+            or None if the image is unreadable
+        """
+        template = get_template(image_path)
+        if isinstance(template, str):
+            logger.warning(f"[MODAL WATCHER] Could not read template: {image_path}")
+            return None
+        full = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+        height, width = full.shape[:2]
+        coarse_size = (width // self.COARSE_SCALE, height // self.COARSE_SCALE)
+        coarse = None
+        if min(coarse_size) >= self.COARSE_MIN_SIZE:
+            coarse = cv2.resize(full, coarse_size, interpolation=cv2.INTER_AREA)
+        return full, coarse
+
+    def _reload_templates(self):
+        """Re-read every registered template from disk (e.g. after assets change)."""
+        load_template.cache_clear()
+        for key, (image_path, _, handler, description) in list(
+            self._modal_handlers.items()
+        ):
+            self._modal_handlers[key] = (
+                image_path,
+                self._load_gray_templates(image_path),
+                handler,
+                description,
+            )
+        self._rebuild_handlers_tuple()
+        logger.debug(
+            f"[MODAL WATCHER] Reloaded {len(self._modal_handlers)} template(s)"
+        )
+
+    def _rebuild_handlers_tuple(self):
+        """Refresh the per-tick snapshot after the registry changes."""
+        self._handlers_tuple = tuple(
+            (templates, handler, description)
+            for _, templates, handler, description in self._modal_handlers.values()
+            if templates is not None
+        )
+        self._last_thumbnail = None
+
     def unregister_modal(self, key: str):
         """Unregister a modal from the watcher."""
         if key in self._modal_handlers:
             del self._modal_handlers[key]
+            self._rebuild_handlers_tuple()
             logger.debug(f"[MODAL WATCHER] Unregistered modal: {key}")
 
     def _dismiss_ok_modal(self, location):
         """
         Handler for Jackson OK modal - clicks twice with delay.
 
+        The second click is scheduled rather than slept for, so the shared
+        scheduler thread stays free while the modal reacts.
+
         Args:
             location: PyAutoGUI location of the modal
         """
+        import pyautogui
+
+        center = pyautogui.center(location)
+        self._click(center)
+        self._paused_until = (
+            time.monotonic()
+            + self.OK_MODAL_SECOND_CLICK_DELAY
+            + self.OK_MODAL_SETTLE_DELAY
+        )
+        schedule_once(self.OK_MODAL_SECOND_CLICK_DELAY, lambda: self._click(center))
+
+    def _click(self, point):
+        """Click a point, unless the watcher has been stopped meanwhile."""
+        import pyautogui
+
+        if not self.is_running():
+            return
         try:
-            center = pyautogui.center(location)
-            pyautogui.click(center)
-            time.sleep(2)
-            pyautogui.click(center)
-            time.sleep(1)
+            pyautogui.click(point)
         except Exception as e:
             logger.warning(f"[MODAL WATCHER] Error dismissing OK modal: {e}")
 
-    def _check_for_modals(self):
+    @staticmethod
+    def _grab_screen():
+        """Take one grayscale screenshot, shared by every template this tick."""
+        import pyautogui
+
+        return np.asarray(pyautogui.screenshot().convert("L"))
+
+    @staticmethod
+    def _best_match(screen, template):
+        """Return (score, (left, top)) of the best template match on screen."""
+        height, width = template.shape[:2]
+        if height > screen.shape[0] or width > screen.shape[1]:
+            return -1.0, (0, 0)
+        result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        return max_val, max_loc
+
+    def _locate(self, screen, screen_small, templates):
+        """
+        Find a template on an already-captured screen, coarse-to-fine.
+
+        Returns:
+            Box(left, top, width, height) usable with pyautogui.center, or None
+        """
+        template, coarse = templates
+        height, width = template.shape[:2]
+        offset_x = offset_y = 0
+        region = screen
+
+        if coarse is not None:
+            score, (left, top) = self._best_match(screen_small, coarse)
+            if score < self.COARSE_CONFIDENCE:
+                return None
+            # Refine at full resolution only around the coarse hit
+            scale = self.COARSE_SCALE
+            offset_x = max(0, left * scale - scale * 2)
+            offset_y = max(0, top * scale - scale * 2)
+            region = screen[
+                offset_y : top * scale + height + scale * 2,
+                offset_x : left * scale + width + scale * 2,
+            ]
+
+        score, (left, top) = self._best_match(region, template)
+        if score < self._confidence:
+            return None
+        return Box(offset_x + left, offset_y + top, width, height)
+
+    def _check_for_modals(self, screen=None):
         """Check for any registered modals and handle them."""
-        for key, (image_path, handler, description) in self._modal_handlers.items():
+        handlers = self._handlers_tuple
+        if not handlers:
+            return False
+        if screen is None:
+            screen = self._grab_screen()
+        # Shared by every template's coarse pass this tick
+        screen_small = cv2.resize(
+            screen,
+            (
+                screen.shape[1] // self.COARSE_SCALE,
+                screen.shape[0] // self.COARSE_SCALE,
+            ),
+            interpolation=cv2.INTER_AREA,
+        )
+        locate = self._locate
+        for templates, handler, description in handlers:
             try:
-                location = pyautogui.locateOnScreen(
-                    image_path, confidence=self._confidence
-                )
+                location = locate(screen, screen_small, templates)
                 if location:
                     logger.info(f"[MODAL WATCHER] Detected: {description}")
                     handler(location)
@@ -109,56 +264,52 @@ class ModalWatcherService:
                     # After handling one modal, restart the loop
                     # to avoid stale state
                     return True
-            except pyautogui.ImageNotFoundException:
-                continue
             except Exception as e:
                 logger.debug(f"[MODAL WATCHER] Error checking {description}: {e}")
         return False
 
-    def _run_watcher(self):
-        """Main watcher loop running in background thread."""
-        logger.info("[MODAL WATCHER] Service started")
-        logger.info(f"[MODAL WATCHER] Check interval: {self.check_interval}s")
-        logger.info(f"[MODAL WATCHER] Watching {len(self._modal_handlers)} modal(s)")
-
-        while not self._stop_event.is_set():
-            try:
-                # Check for modals
-                self._check_for_modals()
-            except Exception as e:
-                logger.debug(f"[MODAL WATCHER] Error in watcher loop: {e}")
-
-            # Wait for the interval or until stopped
-            if self._stop_event.wait(self.check_interval):
-                break  # Stop event was set
-
-        logger.info("[MODAL WATCHER] Service stopped")
+    def _tick(self):
+        """One watcher check, run every check_interval by the scheduler."""
+        if time.monotonic() < self._paused_until:
+            return
+        try:
+            screen = self._grab_screen()
+            thumbnail = screen[::8, ::8].copy()
+            # Skip matching when nothing changed since the last clean tick
+            unchanged = self._last_thumbnail is not None and np.array_equal(
+                thumbnail, self._last_thumbnail
+            )
+            if not unchanged:
+                handled = self._check_for_modals(screen)
+                self._last_thumbnail = None if handled else thumbnail
+        except Exception as e:
+            logger.debug(f"[MODAL WATCHER] Error in watcher loop: {e}")
 
     def start(self):
         """Start the modal watcher service."""
-        if self._thread is not None and self._thread.is_alive():
+        if self.is_running():
             logger.warning("[MODAL WATCHER] Service already running")
             return
 
-        self._stop_event.clear()
-        self._thread = threading.Thread(
-            target=self._run_watcher, daemon=True, name="ModalWatcherThread"
-        )
-        self._thread.start()
+        logger.info("[MODAL WATCHER] Service started")
+        logger.info(f"[MODAL WATCHER] Check interval: {self.check_interval}s")
+        logger.info(f"[MODAL WATCHER] Watching {len(self._modal_handlers)} modal(s)")
+        self._task = schedule_periodic(self.check_interval, self._tick, delay=0)
 
     def stop(self):
         """Stop the modal watcher service."""
-        if self._thread is None:
+        if self._task is None:
             return
 
         logger.info("[MODAL WATCHER] Stopping service...")
-        self._stop_event.set()
-        self._thread.join(timeout=5)
-        self._thread = None
+        # Waits for a tick that is dismissing a modal right now
+        self._task.cancel(timeout=5)
+        self._task = None
+        logger.info("[MODAL WATCHER] Service stopped")
 
     def is_running(self) -> bool:
         """Check if the service is running."""
-        return self._thread is not None and self._thread.is_alive()
+        return self._task is not None and not self._task.cancelled
 
 
 # Singleton instance
@@ -0,0 +1,181 @@
+"""
+Shared background scheduler for short periodic jobs.
+
+Heartbeats and modal watcher ticks spend almost all their time waiting, so
+instead of one mostly-sleeping thread each they share a single daemon thread
+driven by sched.scheduler. Jobs run on that thread must be short: a slow job
+delays every other job. Jobs that block on I/O (e.g. heartbeat requests) are
+scheduled with blocking=True and run on a small worker pool instead, and
+long-running work such as lobby verification keeps its own thread.
+"""
+
+import sched
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from logger import logger
+
+# Set whenever a job is entered, so the runner re-reads the queue instead of
+# sleeping past a newly scheduled earlier job
+_wakeup = threading.Event()
+
+
+def _delay(seconds: float):
+    _wakeup.wait(seconds)
+    _wakeup.clear()
+
+
+_scheduler = sched.scheduler(time.monotonic, _delay)
+_thread: Optional[threading.Thread] = None
+_thread_lock = threading.Lock()
+# Runs blocking=True jobs, so network calls never hold up the scheduler thread
+_executor: Optional[ThreadPoolExecutor] = None
+BLOCKING_WORKERS = 2
+
+
+def _run():
+    """Run due jobs forever; idle on the wakeup event while the queue is empty."""
+    while True:
+        _scheduler.run()
+        _wakeup.wait()
+        _wakeup.clear()
+
+
+def _ensure_thread():
+    """Start the scheduler thread on first use."""
+    global _thread
+    with _thread_lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(
+                target=_run, name="ServiceScheduler", daemon=True
+            )
+            _thread.start()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Create the worker pool for blocking jobs on first use."""
+    global _executor
+    with _thread_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=BLOCKING_WORKERS, thread_name_prefix="ServiceJob"
+            )
+        return _executor
+
+
+class PeriodicTask:
+    """Handle for a job scheduled with schedule_periodic."""
+
+    def __init__(
+        self,
+        interval: float,
+        callback: Callable[[], None],
+        priority: int,
+        blocking: bool = False,
+    ):
+        self.interval = interval
+        self._callback = callback
+        self._priority = priority
+        self._blocking = blocking
+        self._event = None
+        self._cancelled = False
+        self._lock = threading.Lock()
+        # Held while the callback runs, so cancel() can wait for it to finish
+        self._running = threading.Lock()
+
+    def _enter(self, delay: float):
+        with self._lock:
+            if not self._cancelled:
+                self._event = _scheduler.enter(delay, self._priority, self._fire)
+        _wakeup.set()
+
+    def _fire(self):
+        if self._blocking:
+            _get_executor().submit(self._run)
+        else:
+            self._run()
+
+    def _run(self):
+        with self._running:
+            if self._cancelled:
+                return
+            try:
+                self._callback()
+            except Exception as e:
+                name = getattr(self._callback, "__qualname__", self._callback)
+                logger.error(f"[SCHEDULER] Job {name} failed: {e}")
+        # Fixed delay between runs, so a slow run never queues up a burst
+        self._enter(self.interval)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self, timeout: Optional[float] = None):
+        """
+        Stop the job from running again.
+
+        Args:
+            timeout: If given, also wait up to this many seconds for a run
+                     that is already in progress to finish
+        """
+        with self._lock:
+            self._cancelled = True
+            event, self._event = self._event, None
+        if event is not None:
+            try:
+                _scheduler.cancel(event)
+            except ValueError:
+                pass  # Already popped for running
+        if timeout is not None and threading.current_thread() is not _thread:
+            if self._running.acquire(timeout=timeout):
+                self._running.release()
+
+
+def schedule_periodic(
+    interval: float,
+    callback: Callable[[], None],
+    delay: Optional[float] = None,
+    priority: int = 1,
+    blocking: bool = False,
+) -> PeriodicTask:
+    """
+    Run callback every interval seconds on the shared scheduler thread.
+
+    Args:
+        interval: Seconds between the end of one run and the start of the next
+        callback: Job to run; exceptions are logged and do not stop the job
+        delay: Seconds before the first run (defaults to interval)
+        priority: Tie-breaker for jobs due at the same time (lower runs first)
+        blocking: Run callback on the worker pool instead of the scheduler
+                  thread (for jobs that wait on the network)
+
+    Returns:
+        PeriodicTask whose cancel() stops the job
+    """
+    _ensure_thread()
+    task = PeriodicTask(interval, callback, priority, blocking)
+    task._enter(interval if delay is None else delay)
+    return task
+
+
+def schedule_once(delay: float, callback: Callable[[], None], priority: int = 1):
+    """
+    Run a short callback once, delay seconds from now, on the scheduler thread.
+
+    Lets a job wait between steps by scheduling its next step instead of
+    sleeping on the shared thread.
+    """
+
+    def run():
+        try:
+            callback()
+        except Exception as e:
+            name = getattr(callback, "__qualname__", callback)
+            logger.error(f"[SCHEDULER] Job {name} failed: {e}")
+
+    _ensure_thread()
+    _scheduler.enter(delay, priority, run)
+    _wakeup.set()
@@ -4,6 +4,8 @@ ROI Calibrator - Draw rectangles on an image to get coordinates.
 Usage:
     python roi_calibrator.py                     # Capture current screen
     python roi_calibrator.py image.png           # Use specific image
+    python roi_calibrator.py --fit image.png     # Shrink large images to fit
+    python roi_calibrator.py --monitor primary   # Capture the primary display only
 
 Instructions:
     1. Run the script (with or without image)
@@ -13,17 +15,33 @@ Instructions:
     5. Coordinates are printed to console (100% accurate)
     6. Copy to rpa_config.json
 
-Note: The image is always displayed at 100% for maximum precision.
-      If larger than the screen, use scroll to navigate.
+Note: By default the image is displayed at 100% for maximum precision.
+      If larger than the screen, use scroll to navigate, or pass --fit to
+      display it downscaled (coordinates are still reported in image pixels,
+      accurate to the display scale).
 """
 
+import argparse
 import sys
 import tkinter as tk
+import tkinter.font as tkfont
+from collections import OrderedDict
 from PIL import Image, ImageGrab, ImageTk
 
+try:
+    import mss  # Optional: much faster screen capture than ImageGrab
+except ImportError:
+    mss = None
+
+# The image is shown as TILE_SIZE x TILE_SIZE tiles, and only the tiles
+# near the viewport exist as Tk images
+TILE_SIZE = 512
+# Off-screen tile images kept for scrolling back (~1 MB each at 512px)
+TILE_CACHE_SIZE = 48
+
 
 class ROICalibrator:
-    def __init__(self, image_path: str = None):
+    def __init__(self, image_path: str = None, fit: bool = False, monitor: str = None):
         self.root = tk.Tk()
         self.root.title("ROI Calibrator - Draw regions")
 
@@ -35,11 +53,16 @@ class ROICalibrator:
             except Exception as e:
                 print(f"❌ Error loading image: {e}")
                 print("   Using screen capture...")
-                self.screenshot = ImageGrab.grab()
+                self.screenshot = self._grab_screen(monitor)
         else:
-            self.screenshot = ImageGrab.grab()
+            self.screenshot = self._grab_screen(monitor)
             print("📷 Using current screen capture")
 
+        # Opaque RGB once up front: Tk composites alpha (and expands palettes)
+        # on every redraw of an RGBA/P image, and crops inherit the mode
+        if self.screenshot.mode != "RGB":
+            self.screenshot = self.screenshot.convert("RGB")
+
         self.img_width = self.screenshot.width
         self.img_height = self.screenshot.height
         print(f"   Size: {self.img_width} x {self.img_height}")
@@ -50,14 +73,44 @@ class ROICalibrator:
         max_win_width = int(screen_width * 0.90)
         max_win_height = int(screen_height * 0.85)  # Leave space for labels
 
+        # With --fit, display a downscaled copy instead of scrolling; the canvas
+        # then works in display pixels and only reported values are scaled back
+        self.scale = 1.0
+        self.display_img = self.screenshot
+        if fit:
+            self.scale = min(
+                max_win_width / self.img_width,
+                (max_win_height - 80) / self.img_height,
+                1.0,
+            )
+        if self.scale < 1.0:
+            factor = round(1 / self.scale)
+            if 0 <= factor - 1 / self.scale < 0.05:
+                # (Near-)integer factor, rounded so the image still fits:
+                # Pillow's reduce() is a single strided box pass, much cheaper
+                # than a general resample
+                self.scale = 1 / factor
+                self.display_img = self.screenshot.reduce(factor)
+            else:
+                self.display_img = self.screenshot.resize(
+                    (
+                        int(self.img_width * self.scale),
+                        int(self.img_height * self.scale),
+                    ),
+                    Image.NEAREST,
+                )
+            print(f"   🔍 Displayed at {self.scale:.0%} (--fit)")
+        display_width = self.display_img.width
+        display_height = self.display_img.height
+
         # Determine if scroll is needed
         self.needs_scroll = (
-            self.img_width > max_win_width or self.img_height > max_win_height
+            display_width > max_win_width or display_height > max_win_height
         )
 
         # Viewport size (visible canvas area)
-        viewport_width = min(self.img_width, max_win_width)
-        viewport_height = min(self.img_height, max_win_height - 80)  # Space for labels
+        viewport_width = min(display_width, max_win_width)
+        viewport_height = min(display_height, max_win_height - 80)  # Space for labels
 
         if self.needs_scroll:
             print(f"   📜 Large image - scroll enabled")
@@ -76,14 +129,20 @@ class ROICalibrator:
             self.canvas_frame,
             width=viewport_width,
             height=viewport_height,
-            xscrollcommand=self.h_scrollbar.set,
-            yscrollcommand=self.v_scrollbar.set,
-            scrollregion=(0, 0, self.img_width, self.img_height),
+            bg="gray20",  # Shown until the first tiles are uploaded
+            xscrollcommand=self._on_xscroll,
+            yscrollcommand=self._on_yscroll,
+            scrollregion=(0, 0, display_width, display_height),
         )
 
         # Configure scrollbars
-        self.h_scrollbar.config(command=self.canvas.xview)
-        self.v_scrollbar.config(command=self.canvas.yview)
+        self.h_scrollbar.config(command=self._xview)
+        self.v_scrollbar.config(command=self._yview)
+
+        # Canvas scroll offset, cached so pointer events are converted to
+        # canvas coordinates without a Tcl call (see _update_offsets)
+        self._xoff = 0
+        self._yoff = 0
 
         # Layout with grid
         self.canvas.grid(row=0, column=0, sticky="nsew")
@@ -94,18 +153,50 @@ class ROICalibrator:
         self.canvas_frame.grid_rowconfigure(0, weight=1)
         self.canvas_frame.grid_columnconfigure(0, weight=1)
 
-        # Display screenshot at 100%
-        self.photo = ImageTk.PhotoImage(self.screenshot)
-        self.canvas.create_image(0, 0, anchor=tk.NW, image=self.photo)
+        # Display screenshot (at 100% unless --fit downscaled it), one tile
+        # at a time so memory follows the viewport rather than the image
+        self.tiles = {}  # (tx, ty) -> (PhotoImage, canvas item id)
+        self._tile_cache = OrderedDict()  # (tx, ty) -> PhotoImage, LRU order
+        self._tile_cols = -(-display_width // TILE_SIZE)
+        self._tile_rows = -(-display_height // TILE_SIZE)
+        self._tiles_job = None  # Pending after_idle tile refresh
+        self._pending_scroll = [0, 0]  # Accumulated wheel units (x, y)
+        self._scroll_job = None  # Pending after_idle scroll
+        self._last_size = (0, 0)  # Canvas size at the last <Configure>
+        self.canvas.bind("<Configure>", self._on_resize)
+        # Upload the first tiles once the event loop is running, so the
+        # window paints right away instead of after the pixmap upload
+        self._schedule_tile_refresh()
 
         # Variables for drawing
         self.start_x = None
         self.start_y = None
-        self.current_rect = None  # Rectangle being drawn
-        self.saved_rects = []  # Saved rectangles (permanent)
-        self.saved_texts = []  # Rectangle texts
+        # Rectangle being drawn: a single item, moved and shown/hidden as needed
+        self.current_rect = self.canvas.create_rectangle(
+            0,
+            0,
+            0,
+            0,
+            outline="red",
+            width=2,
+            dash=(4, 2),  # Dashed line while dragging
+            state="hidden",
+        )
+        self._drag_job = None  # Pending after_idle redraw of current_rect
+        self._last_xy = (0, 0)  # Latest drag position, drawn by _flush_drag
+        self._rect_visible = False  # Whether current_rect is shown
+        # Saved regions as parallel columns of image coordinates (one entry
+        # per region). Their canvas items are tagged "saved" and "region<n>",
+        # so they can be deleted in a single call.
+        self.regions = {"x1": [], "y1": [], "w": [], "h": []}
         self.region_count = 0  # Region counter
 
+        # Label font, measured in Python instead of asking the canvas for bbox
+        self._label_font = tkfont.Font(
+            root=self.root, family="Arial", size=10, weight="bold"
+        )
+        self._label_height = self._label_font.metrics("linespace")
+
         # Bindings for drawing
         self.canvas.bind("<Button-1>", self.on_press)
         self.canvas.bind("<B1-Motion>", self.on_drag)
@@ -123,12 +214,14 @@ class ROICalibrator:
         self.root.bind("<C>", self.clear_all)
         self.root.bind("<z>", self.undo_last)
         self.root.bind("<Z>", self.undo_last)
+        self.root.bind("<j>", self.dump_json)
+        self.root.bind("<J>", self.dump_json)
 
         # Instructions label
         scroll_info = " | Scroll: Mouse wheel" if self.needs_scroll else ""
         self.label = tk.Label(
             self.root,
-            text=f"🖱️ Draw rectangles | C = Clear | Z = Undo | ESC = Exit{scroll_info}",
+            text=f"🖱️ Draw rectangles | C = Clear | Z = Undo | J = All JSON | ESC = Exit{scroll_info}",
             font=("Arial", 11),
             bg="yellow",
         )
@@ -147,64 +240,226 @@ class ROICalibrator:
         print("  - Click + drag     → Draw region")
         print("  - C                → Clear all")
         print("  - Z                → Undo last")
+        print("  - J                → Print all regions as JSON")
         print("  - ESC              → Exit")
         if self.needs_scroll:
             print("-" * 60)
             print("  - Mouse wheel      → Vertical scroll")
             print("  - Shift + Wheel    → Horizontal scroll")
         print("=" * 60)
-        print("📍 100% accurate coordinates (unscaled image)")
+        if self.scale < 1.0:
+            print(
+                f"📍 Coordinates in image pixels (±{1 / self.scale:.0f} px at this scale)"
+            )
+        else:
+            print("📍 100% accurate coordinates (unscaled image)")
         print("=" * 60 + "\n")
 
+    def _grab_screen(self, monitor: str = None):
+        """
+        Capture the screen.
+
+        monitor="primary" grabs only the primary display (a fraction of the
+        pixels of a multi-monitor desktop), "all" grabs every display, and
+        None keeps the platform default.
+        Uses mss when it is installed, otherwise PIL.ImageGrab (which can
+        only single out the primary display on Windows).
+        """
+        if mss is not None:
+            # mss monitors: 0 = whole virtual desktop, 1 = primary display.
+            # ImageGrab's default is the primary display on Windows only.
+            if monitor == "all" or (monitor is None and sys.platform != "win32"):
+                index = 0
+            else:
+                index = 1
+            with mss.mss() as sct:
+                raw = sct.grab(sct.monitors[index])
+            # BGRX buffer decoded straight into RGB, no intermediate copy
+            return Image.frombuffer("RGB", raw.size, raw.bgra, "raw", "BGRX")
+
+        if monitor == "primary":
+            # On Windows ImageGrab already captures only the primary display,
+            # in physical pixels. Tk's screen size is in logical pixels there
+            # (and the whole virtual screen on X11), so it is no usable bbox.
+            if sys.platform == "win32":
+                return ImageGrab.grab(all_screens=False)
+            print("   ⚠️ --monitor primary needs mss on this platform")
+            print("   Capturing the whole screen instead")
+        if monitor == "all":
+            return ImageGrab.grab(all_screens=True)
+        return ImageGrab.grab()
+
+    def _update_offsets(self):
+        """Re-read the canvas scroll offset after the view has moved."""
+        self._xoff = int(self.canvas.canvasx(0))
+        self._yoff = int(self.canvas.canvasy(0))
+
+    def _xview(self, *args):
+        """Horizontal scrollbar command."""
+        self.canvas.xview(*args)
+        self._update_offsets()
+
+    def _yview(self, *args):
+        """Vertical scrollbar command."""
+        self.canvas.yview(*args)
+        self._update_offsets()
+
+    def _on_xscroll(self, first, last):
+        """Canvas x view changed: update the scrollbar and visible tiles."""
+        self.h_scrollbar.set(first, last)
+        self._update_offsets()
+        self._schedule_tile_refresh()
+
+    def _on_yscroll(self, first, last):
+        """Canvas y view changed: update the scrollbar and visible tiles."""
+        self.v_scrollbar.set(first, last)
+        self._update_offsets()
+        self._schedule_tile_refresh()
+
+    def _on_resize(self, event):
+        """Refresh tiles only when the canvas size actually changed."""
+        size = (event.width, event.height)
+        if size == self._last_size:
+            return  # e.g. the window was only moved
+        self._last_size = size
+        self._schedule_tile_refresh()
+
+    def _schedule_tile_refresh(self):
+        """Refresh tiles once per idle cycle, however many view changes arrive."""
+        if self._tiles_job is None:
+            self._tiles_job = self.canvas.after_idle(self._refresh_visible_tiles)
+
+    def _refresh_visible_tiles(self):
+        """Create tiles in (or one tile around) the viewport, drop the rest."""
+        self._tiles_job = None
+        view_w = self.canvas.winfo_width()
+        view_h = self.canvas.winfo_height()
+        if view_w <= 1 or view_h <= 1:  # Not mapped yet: use requested size
+            view_w = int(self.canvas.cget("width"))
+            view_h = int(self.canvas.cget("height"))
+        left = self._xoff // TILE_SIZE
+        top = self._yoff // TILE_SIZE
+        right = (self._xoff + view_w) // TILE_SIZE
+        bottom = (self._yoff + view_h) // TILE_SIZE
+
+        visible = {
+            (tx, ty)
+            for tx in range(max(0, left - 1), min(self._tile_cols, right + 2))
+            for ty in range(max(0, top - 1), min(self._tile_rows, bottom + 2))
+        }
+
+        for key in [key for key in self.tiles if key not in visible]:
+            photo, item = self.tiles.pop(key)
+            self.canvas.delete(item)
+            # Keep the uploaded image so scrolling back does not rebuild it
+            self._tile_cache[key] = photo
+            if len(self._tile_cache) > TILE_CACHE_SIZE:
+                self._tile_cache.popitem(last=False)
+
+        for tx, ty in visible:
+            if (tx, ty) in self.tiles:
+                continue
+            photo = self._tile_cache.pop((tx, ty), None)
+            if photo is None:
+                photo = self._build_tile(tx, ty)
+            x, y = tx * TILE_SIZE, ty * TILE_SIZE
+            item = self.canvas.create_image(x, y, anchor=tk.NW, image=photo)
+            self.canvas.tag_lower(item)  # Keep rectangles above the image
+            self.tiles[(tx, ty)] = (photo, item)
+
+    def _build_tile(self, tx, ty):
+        """Crop one tile from the display image and upload it to Tk."""
+        x, y = tx * TILE_SIZE, ty * TILE_SIZE
+        box = (
+            x,
+            y,
+            min(x + TILE_SIZE, self.display_img.width),
+            min(y + TILE_SIZE, self.display_img.height),
+        )
+        return ImageTk.PhotoImage(self.display_img.crop(box))
+
     def on_mousewheel_y(self, event):
         """Vertical scroll with mouse wheel."""
-        self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+        self._pending_scroll[1] += int(-1 * (event.delta / 120))
+        self._schedule_scroll()
 
     def on_mousewheel_x(self, event):
         """Horizontal scroll with Shift + mouse wheel."""
-        self.canvas.xview_scroll(int(-1 * (event.delta / 120)), "units")
+        self._pending_scroll[0] += int(-1 * (event.delta / 120))
+        self._schedule_scroll()
+
+    def _schedule_scroll(self):
+        """Apply accumulated wheel notches once per idle cycle."""
+        if self._scroll_job is None:
+            self._scroll_job = self.canvas.after_idle(self._do_scroll)
+
+    def _do_scroll(self):
+        self._scroll_job = None
+        dx, dy = self._pending_scroll
+        self._pending_scroll = [0, 0]
+        if dx:
+            self.canvas.xview_scroll(dx, "units")
+        if dy:
+            self.canvas.yview_scroll(dy, "units")
+        if dx or dy:
+            self._update_offsets()
 
     def _canvas_coords(self, event):
-        """Convert event coordinates to real canvas (image) coordinates."""
-        # canvasx/canvasy convert window coordinates to canvas coordinates
-        return int(self.canvas.canvasx(event.x)), int(self.canvas.canvasy(event.y))
+        """Convert event coordinates to real canvas (display) coordinates."""
+        # Same as canvasx/canvasy, using the cached scroll offset
+        return event.x + self._xoff, event.y + self._yoff
+
+    def _to_image(self, value):
+        """Map a canvas (display) coordinate back to source image pixels."""
+        return round(value / self.scale)
 
     def on_press(self, event):
         self.start_x, self.start_y = self._canvas_coords(event)
+        self._hide_current_rect()
 
     def on_drag(self, event):
-        # Delete previous temporary rectangle
-        if self.current_rect:
-            self.canvas.delete(self.current_rect)
-
-        # Get real canvas coordinates
-        curr_x, curr_y = self._canvas_coords(event)
-
-        # Draw new temporary rectangle (while dragging)
-        self.current_rect = self.canvas.create_rectangle(
-            self.start_x,
-            self.start_y,
-            curr_x,
-            curr_y,
-            outline="red",
-            width=2,
-            dash=(4, 2),  # Dashed line while dragging
+        # Only remember the position; motion events arrive much faster than
+        # the canvas can redraw, so the rectangle is moved once per idle cycle
+        self._last_xy = self._canvas_coords(event)
+        if self._drag_job is None:
+            self._drag_job = self.canvas.after_idle(self._flush_drag)
+
+    def _flush_drag(self):
+        """Move the temporary rectangle to the latest drag position."""
+        self._drag_job = None
+        self.canvas.coords(
+            self.current_rect, self.start_x, self.start_y, *self._last_xy
         )
+        # Moving the item is all a redraw needs; its state only changes once
+        if not self._rect_visible:
+            self.canvas.itemconfigure(self.current_rect, state="normal")
+            self._rect_visible = True
+
+    def _hide_current_rect(self):
+        """Hide the temporary rectangle (kept for reuse, never deleted)."""
+        if self._rect_visible:
+            self.canvas.itemconfigure(self.current_rect, state="hidden")
+            self._rect_visible = False
 
     def on_release(self, event):
-        # Delete temporary rectangle
-        if self.current_rect:
-            self.canvas.delete(self.current_rect)
-            self.current_rect = None
+        # Hide temporary rectangle (and drop a redraw still waiting for idle)
+        if self._drag_job is not None:
+            self.canvas.after_cancel(self._drag_job)
+            self._drag_job = None
+        self._hide_current_rect()
 
         # Get real canvas coordinates
         end_x, end_y = self._canvas_coords(event)
 
-        # Calculate normalized coordinates (x1 < x2, y1 < y2)
-        x1 = min(self.start_x, end_x)
-        y1 = min(self.start_y, end_y)
-        x2 = max(self.start_x, end_x)
-        y2 = max(self.start_y, end_y)
+        # Calculate normalized canvas coordinates (cx1 < cx2, cy1 < cy2)
+        cx1 = min(self.start_x, end_x)
+        cy1 = min(self.start_y, end_y)
+        cx2 = max(self.start_x, end_x)
+        cy2 = max(self.start_y, end_y)
+
+        # Same region in source image pixels (identical unless --fit)
+        x1, y1 = self._to_image(cx1), self._to_image(cy1)
+        x2, y2 = self._to_image(cx2), self._to_image(cy2)
 
         w = x2 - x1
         h = y2 - y1
@@ -215,50 +470,80 @@ class ROICalibrator:
         self.region_count += 1
 
         # Create PERMANENT rectangle (solid line)
-        rect = self.canvas.create_rectangle(x1, y1, x2, y2, outline="red", width=2)
-        self.saved_rects.append(rect)
+        tags = ("saved", f"region{self.region_count}")
+        self.canvas.create_rectangle(
+            cx1, cy1, cx2, cy2, outline="red", width=2, tags=tags
+        )
 
         # Add label with number and dimensions
         label_text = f"#{self.region_count} ({w}x{h})"
-        text = self.canvas.create_text(
-            x1 + 5,
-            y1 + 5,
+        label_x, label_y = cx1 + 5, cy1 + 5
+        # Background first, sized from the font metrics, so the text is
+        # created on top without a bbox query or a restack
+        self.canvas.create_rectangle(
+            label_x,
+            label_y,
+            label_x + self._label_font.measure(label_text),
+            label_y + self._label_height,
+            fill="red",
+            outline="red",
+            tags=tags,
+        )
+        self.canvas.create_text(
+            label_x,
+            label_y,
             text=label_text,
             anchor=tk.NW,
             fill="white",
-            font=("Arial", 10, "bold"),
+            font=self._label_font,
+            tags=tags,
         )
-        # Background for text
-        bbox = self.canvas.bbox(text)
-        bg = self.canvas.create_rectangle(bbox, fill="red", outline="red")
-        self.canvas.tag_raise(text, bg)
 
-        self.saved_texts.append(text)
-        self.saved_texts.append(bg)
+        for column, value in (("x1", x1), ("y1", y1), ("w", w), ("h", h)):
+            self.regions[column].append(value)
 
         # JSON format for rpa_config.json
-        json_output = f'"region_{self.region_count}": {{ "x": {x1}, "y": {y1}, "w": {w}, "h": {h} }}'
-
-        # Show in console
-        print(f"\n📍 Region #{self.region_count}:")
-        print(f"   Position: ({x1}, {y1}) → ({x2}, {y2})")
-        print(f"   Size: {w} x {h}")
-        print(f"\n   {json_output}")
+        json_output = self._region_json(self.region_count, x1, y1, w, h)
+
+        # Show in console (one write, since Tk waits for this callback)
+        sys.stdout.write(
+            f"\n📍 Region #{self.region_count}:\n"
+            f"   Position: ({x1}, {y1}) → ({x2}, {y2})\n"
+            f"   Size: {w} x {h}\n"
+            f"\n   {json_output}\n"
+        )
 
         # Show in label
         self.coords_label.config(text=json_output)
 
+    @staticmethod
+    def _region_json(number, x, y, w, h):
+        """One region in rpa_config.json format."""
+        return f'"region_{number}": {{ "x": {x}, "y": {y}, "w": {w}, "h": {h} }}'
+
+    def dump_json(self, event=None):
+        """Print every saved region as one JSON block, ready to paste."""
+        regions = self.regions
+        if not regions["x1"]:
+            print("\nℹ️ No regions to export")
+            return
+        lines = map(
+            self._region_json,
+            range(1, len(regions["x1"]) + 1),
+            regions["x1"],
+            regions["y1"],
+            regions["w"],
+            regions["h"],
+        )
+        print("\n{\n    " + ",\n    ".join(lines) + "\n}")
+
     def undo_last(self, event=None):
         """Undo the last rectangle."""
-        if self.saved_rects:
-            # Delete last rectangle
-            rect = self.saved_rects.pop()
-            self.canvas.delete(rect)
-
-            # Delete associated texts (text + background)
-            if len(self.saved_texts) >= 2:
-                self.canvas.delete(self.saved_texts.pop())
-                self.canvas.delete(self.saved_texts.pop())
+        if self.region_count:
+            # Delete last rectangle and its label (text + background)
+            self.canvas.delete(f"region{self.region_count}")
+            for column in self.regions.values():
+                column.pop()
 
             self.region_count -= 1
             print(f"\n↩️ Undone region #{self.region_count + 1}")
@@ -266,13 +551,10 @@ class ROICalibrator:
 
     def clear_all(self, event=None):
         """Clear all rectangles."""
-        for rect in self.saved_rects:
-            self.canvas.delete(rect)
-        for text in self.saved_texts:
-            self.canvas.delete(text)
+        self.canvas.delete("saved")
 
-        self.saved_rects.clear()
-        self.saved_texts.clear()
+        for column in self.regions.values():
+            column.clear()
         self.region_count = 0
         self.coords_label.config(text="")
         print("\n🧹 All cleared")
@@ -282,8 +564,19 @@ class ROICalibrator:
 
 
 if __name__ == "__main__":
-    # Get image from argument if provided
-    image_path = sys.argv[1] if len(sys.argv) > 1 else None
-
-    calibrator = ROICalibrator(image_path)
+    parser = argparse.ArgumentParser(description="Draw regions to get coordinates.")
+    parser.add_argument("image", nargs="?", help="Image to use (default: screen)")
+    parser.add_argument(
+        "--fit",
+        action="store_true",
+        help="Downscale images larger than the screen instead of scrolling",
+    )
+    parser.add_argument(
+        "--monitor",
+        choices=("primary", "all"),
+        help="Screen capture area (default: platform default)",
+    )
+    args = parser.parse_args()
+
+    calibrator = ROICalibrator(args.image, fit=args.fit, monitor=args.monitor)
     calibrator.run()
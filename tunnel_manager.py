@@ -2,33 +2,201 @@
 Tunnel Manager - Manages Cloudflare tunnel
 """
 
+import hashlib
 import os
+import re
 import subprocess
 import platform
+import threading
+import time
 import base64
 import json
+from collections import deque
 from pathlib import Path
 from typing import Optional, Dict
 import requests
 from config import config
 from logger import logger
+from services.http_session import create_session
+
+# Platform-specific process settings, resolved once at import
+_IS_WINDOWS = platform.system() == "Windows"
+
+if _IS_WINDOWS:
+    # Hide console windows of child processes (Popen copies this object)
+    _STARTUPINFO = subprocess.STARTUPINFO()
+    _STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    _STARTUPINFO.wShowWindow = subprocess.SW_HIDE
+    _CREATION_FLAGS = subprocess.CREATE_NO_WINDOW
+
+    # Job objects let stop_tunnel kill cloudflared's whole process tree
+    # without spawning taskkill.exe
+    import ctypes
+    from ctypes import wintypes
+
+    _JOB_OBJECT_EXTENDED_LIMIT_INFORMATION = 9
+    _JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE = 0x2000
+    _PROCESS_SET_QUOTA = 0x0100
+    _PROCESS_TERMINATE = 0x0001
+
+    class _JOBOBJECT_BASIC_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("PerProcessUserTimeLimit", ctypes.c_int64),
+            ("PerJobUserTimeLimit", ctypes.c_int64),
+            ("LimitFlags", wintypes.DWORD),
+            ("MinimumWorkingSetSize", ctypes.c_size_t),
+            ("MaximumWorkingSetSize", ctypes.c_size_t),
+            ("ActiveProcessLimit", wintypes.DWORD),
+            ("Affinity", ctypes.c_size_t),
+            ("PriorityClass", wintypes.DWORD),
+            ("SchedulingClass", wintypes.DWORD),
+        ]
+
+    class _IO_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            (name, ctypes.c_uint64)
+            for name in (
+                "ReadOperationCount",
+                "WriteOperationCount",
+                "OtherOperationCount",
+                "ReadTransferCount",
+                "WriteTransferCount",
+                "OtherTransferCount",
+            )
+        ]
+
+    class _JOBOBJECT_EXTENDED_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("BasicLimitInformation", _JOBOBJECT_BASIC_LIMIT_INFORMATION),
+            ("IoInfo", _IO_COUNTERS),
+            ("ProcessMemoryLimit", ctypes.c_size_t),
+            ("JobMemoryLimit", ctypes.c_size_t),
+            ("PeakProcessMemoryUsed", ctypes.c_size_t),
+            ("PeakJobMemoryUsed", ctypes.c_size_t),
+        ]
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.CreateJobObjectW.argtypes = [wintypes.LPVOID, wintypes.LPCWSTR]
+    _kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+    _kernel32.SetInformationJobObject.argtypes = [
+        wintypes.HANDLE,
+        ctypes.c_int,
+        wintypes.LPVOID,
+        wintypes.DWORD,
+    ]
+    _kernel32.SetInformationJobObject.restype = wintypes.BOOL
+    _kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+    _kernel32.AssignProcessToJobObject.argtypes = [wintypes.HANDLE, wintypes.HANDLE]
+    _kernel32.AssignProcessToJobObject.restype = wintypes.BOOL
+    _kernel32.TerminateJobObject.argtypes = [wintypes.HANDLE, wintypes.UINT]
+    _kernel32.TerminateJobObject.restype = wintypes.BOOL
+    _kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    _kernel32.CloseHandle.restype = wintypes.BOOL
+else:
+    _STARTUPINFO = None
+    _CREATION_FLAGS = 0
 
 
 def _get_subprocess_startupinfo():
     """Get startupinfo for subprocess to hide console windows on Windows"""
-    if platform.system() == "Windows":
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        startupinfo.wShowWindow = subprocess.SW_HIDE
-        return startupinfo
-    return None
+    return _STARTUPINFO
 
 
 def _get_subprocess_creation_flags():
     """Get creation flags for subprocess to hide console windows on Windows"""
-    if platform.system() == "Windows":
-        return subprocess.CREATE_NO_WINDOW
-    return 0
+    return _CREATION_FLAGS
+
+
+def _create_kill_job(pid: int):
+    """
+    Put a process in a new job object that kills it (and any children it
+    starts later) when the job is terminated or its handle is closed.
+
+    Returns:
+        Job handle, or None if the job could not be set up
+    """
+    job = _kernel32.CreateJobObjectW(None, None)
+    if not job:
+        return None
+    info = _JOBOBJECT_EXTENDED_LIMIT_INFORMATION()
+    info.BasicLimitInformation.LimitFlags = _JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE
+    process = _kernel32.OpenProcess(_PROCESS_SET_QUOTA | _PROCESS_TERMINATE, False, pid)
+    assigned = False
+    if process:
+        assigned = _kernel32.SetInformationJobObject(
+            job,
+            _JOB_OBJECT_EXTENDED_LIMIT_INFORMATION,
+            ctypes.byref(info),
+            ctypes.sizeof(info),
+        ) and _kernel32.AssignProcessToJobObject(job, process)
+        _kernel32.CloseHandle(process)
+    if not assigned:
+        _kernel32.CloseHandle(job)
+        return None
+    return job
+
+
+def _write_atomic(path: Path, data: bytes):
+    """Write data to a temp file next to path, then rename it over path."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+# cloudflared release downloads by (platform.system(), normalized arch)
+_CLOUDFLARED_RELEASES = (
+    "https://github.com/cloudflare/cloudflared/releases/latest/download/"
+)
+_CLOUDFLARED_URLS = {
+    ("windows", "amd64"): _CLOUDFLARED_RELEASES + "cloudflared-windows-amd64.exe",
+    ("windows", "386"): _CLOUDFLARED_RELEASES + "cloudflared-windows-386.exe",
+    ("linux", "amd64"): _CLOUDFLARED_RELEASES + "cloudflared-linux-amd64",
+    ("linux", "arm64"): _CLOUDFLARED_RELEASES + "cloudflared-linux-arm64",
+    ("darwin", "amd64"): _CLOUDFLARED_RELEASES + "cloudflared-darwin-amd64.tgz",
+    ("darwin", "arm64"): _CLOUDFLARED_RELEASES + "cloudflared-darwin-arm64.tgz",
+}
+# platform.machine() values mapped to cloudflared's architecture names
+_ARCH_NORMALIZE = {
+    "x86_64": "amd64",
+    "amd64": "amd64",
+    "i386": "386",
+    "i686": "386",
+    "aarch64": "arm64",
+    "arm64": "arm64",
+}
+
+# Block size for streaming the cloudflared download to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# credentials-file line of the backend's config.yml template
+_CRED_RE = re.compile(rb"credentials-file:.*")
+
+# Sidecar recording which payload produced the current config.yml
+CONFIG_CACHE_FILE = ".config-cache"
+
+# cloudflared logs this once per edge connection (e.g. "Registered tunnel
+# connection connIndex=0 ...")
+TUNNEL_READY_MARKER = b"registered tunnel connection"
+
+# cloudflared output is read in blocks of this size and split into lines
+OUTPUT_READ_SIZE = 64 * 1024
+# Last lines of cloudflared output kept for get_tunnel_logs()
+OUTPUT_HISTORY_LINES = 200
+# cloudflared level tokens logged as warnings
+_CLOUDFLARED_ERROR_LEVELS = (b" ERR ", b" FTL ")
+
+# cloudflared output file (tunnel.log_to_file), rotated to a single ".1"
+# backup at start once it grows past CLOUDFLARED_LOG_MAX_BYTES
+CLOUDFLARED_LOG_FILE = "cloudflared.log"
+CLOUDFLARED_LOG_MAX_BYTES = 5 * 1024 * 1024
+# Seconds between reads of the log file while it has no new output
+LOG_TAIL_INTERVAL = 0.2
+
+# start_tunnel reports failure if cloudflared exits within this many seconds
+STARTUP_CHECK_SECONDS = 2.0
+STARTUP_POLL_INTERVAL = 0.1
 
 
 class TunnelManager:
@@ -40,6 +208,16 @@ class TunnelManager:
         self.cloudflared_dir = config.get_cloudflared_dir()
         self.cloudflared_exe = self._get_cloudflared_path()
         self.tunnel_process: Optional[subprocess.Popen] = None
+        # Set once cloudflared reports a registered edge connection
+        self.ready_event = threading.Event()
+        self._recent_output = deque(maxlen=OUTPUT_HISTORY_LINES)
+        self._session: Optional[requests.Session] = None
+        # cloudflared is never removed while running, so a found binary stays found
+        self._cloudflared_found = False
+        # Windows job object holding cloudflared's process tree
+        self._job = None
+        # Set once save_tunnel_config has written or confirmed config.yml
+        self._config_ready = False
 
         logger.info("TunnelManager initialized")
         logger.info(f"App dir: {self.app_dir}")
@@ -48,23 +226,33 @@ class TunnelManager:
 
         # Create necessary directories
         try:
-            self.bin_dir.mkdir(parents=True, exist_ok=True)
-            self.cloudflared_dir.mkdir(parents=True, exist_ok=True)
+            for directory in (self.bin_dir, self.cloudflared_dir):
+                directory.mkdir(parents=True, exist_ok=True)
             logger.info("Directories created successfully")
         except Exception as e:
             logger.error(f"Error creating directories: {e}", exc_info=True)
             raise
 
+    def _get_session(self) -> requests.Session:
+        """Pooled session for the backend and download requests (created lazily)"""
+        if self._session is None:
+            self._session = create_session(
+                retries=3, backoff_factor=0.2, status_forcelist=(502, 503, 504)
+            )
+        return self._session
+
     def _get_cloudflared_path(self) -> Path:
         """Get path to cloudflared executable"""
-        if platform.system() == "Windows":
+        if _IS_WINDOWS:
             return self.bin_dir / "cloudflared.exe"
         else:
             return self.bin_dir / "cloudflared"
 
     def is_cloudflared_available(self) -> bool:
-        """Check if cloudflared is available"""
-        return self.cloudflared_exe.exists()
+        """Check if cloudflared is available (cached once found)"""
+        if not self._cloudflared_found:
+            self._cloudflared_found = self.cloudflared_exe.exists()
+        return self._cloudflared_found
 
     def download_cloudflared(self) -> bool:
         """
@@ -80,50 +268,33 @@ class TunnelManager:
             system = platform.system().lower()
             machine = platform.machine().lower()
 
-            # Download URLs
-            urls = {
-                "windows": {
-                    "amd64": "https://github.com/cloudflare/cloudflared/releases/latest/download/cloudflared-windows-amd64.exe",
-                    "386": "https://github.com/cloudflare/cloudflared/releases/latest/download/cloudflared-windows-386.exe",
-                },
-                "linux": {
-                    "amd64": "https://github.com/cloudflare/cloudflared/releases/latest/download/cloudflared-linux-amd64",
-                    "x86_64": "https://github.com/cloudflare/cloudflared/releases/latest/download/cloudflared-linux-amd64",
-                    "arm64": "https://github.com/cloudflare/cloudflared/releases/latest/download/cloudflared-linux-arm64",
-                },
-                "darwin": {
-                    "amd64": "https://github.com/cloudflare/cloudflared/releases/latest/download/cloudflared-darwin-amd64.tgz",
-                    "arm64": "https://github.com/cloudflare/cloudflared/releases/latest/download/cloudflared-darwin-arm64.tgz",
-                },
-            }
-
-            # Normalize architecture
-            if machine in ["x86_64", "amd64"]:
-                arch = "amd64"
-            elif machine in ["i386", "i686"]:
-                arch = "386"
-            elif machine in ["aarch64", "arm64"]:
-                arch = "arm64"
-            else:
-                arch = "amd64"  # Default
-
-            url = urls.get(system, {}).get(arch)
+            arch = _ARCH_NORMALIZE.get(machine, "amd64")  # Default to amd64
+            url = _CLOUDFLARED_URLS.get((system, arch))
             if not url:
                 logger.error(f"No URL found for {system}/{arch}")
                 return False
 
             # Download
             logger.info(f"Downloading from {url}...")
-            response = requests.get(url, stream=True, timeout=60)
-            response.raise_for_status()
-
-            # Save
-            with open(self.cloudflared_exe, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Closing the response returns its connection to the session pool
+            with self._get_session().get(url, stream=True, timeout=60) as response:
+                response.raise_for_status()
+
+                # Save (copied in 1 MiB blocks straight from the socket),
+                # hashing each block on the way through
+                response.raw.decode_content = True
+                digest = hashlib.sha256()
+                with open(self.cloudflared_exe, "wb") as f:
+                    while True:
+                        block = response.raw.read(DOWNLOAD_CHUNK_SIZE)
+                        if not block:
+                            break
+                        digest.update(block)
+                        f.write(block)
+            logger.info(f"Cloudflared SHA-256: {digest.hexdigest()}")
 
             # Set execution permissions (Linux/Mac)
-            if system != "windows":
+            if not _IS_WINDOWS:
                 os.chmod(self.cloudflared_exe, 0o755)
 
             logger.info("Cloudflared downloaded successfully")
@@ -147,14 +318,15 @@ class TunnelManager:
         try:
             logger.info(f"Saving tunnel credentials for tunnel ID: {tunnel_id}")
 
-            # Decode base64
-            credentials_json = base64.b64decode(credentials_base64).decode("utf-8")
-            credentials = json.loads(credentials_json)
+            # Decode base64; the JSON is only validated, then written as received
+            # (cloudflared reads it, so there is nothing to re-serialize)
+            credentials_bytes = base64.b64decode(credentials_base64)
+            json.loads(credentials_bytes)
 
-            # Save to file
+            # Save to file (atomically, so a crash never leaves cloudflared a
+            # truncated credentials file)
             credentials_file = self.cloudflared_dir / f"{tunnel_id}.json"
-            with open(credentials_file, "w") as f:
-                json.dump(credentials, f, indent=2)
+            _write_atomic(credentials_file, credentials_bytes)
 
             logger.info(f"Credentials saved: {credentials_file}")
             return True
@@ -177,30 +349,49 @@ class TunnelManager:
         try:
             logger.info("Saving tunnel config")
 
-            # Decode base64
-            config_yaml = base64.b64decode(config_base64).decode("utf-8")
-
             # Fix credentials-file path
             credentials_file = self.cloudflared_dir / f"{tunnel_id}.json"
-            import re
-
             # Convert Windows path to forward slashes
             credentials_path_fixed = str(credentials_file).replace("\\", "/")
-            config_yaml = re.sub(
-                r"credentials-file:.*",
-                f"credentials-file: {credentials_path_fixed}",
-                config_yaml,
+
+            # Same payload as the config.yml on disk: nothing to rewrite
+            config_file = self.cloudflared_dir / "config.yml"
+            cache_file = self.cloudflared_dir / CONFIG_CACHE_FILE
+            cache_key = hashlib.sha256(
+                f"{credentials_path_fixed}\n{config_base64}".encode("utf-8")
+            ).hexdigest()
+            try:
+                cached_key, cached_mtime = cache_file.read_text().split()
+                config_mtime = config_file.stat().st_mtime_ns
+                if cached_key == cache_key and config_mtime == int(cached_mtime):
+                    logger.info(f"Config unchanged: {config_file}")
+                    self._config_ready = True
+                    return True
+            except (OSError, ValueError):
+                pass
+
+            # Rewrite the raw bytes; the YAML is never decoded
+            config_bytes = base64.b64decode(config_base64)
+
+            config_bytes = _CRED_RE.sub(
+                b"credentials-file: " + credentials_path_fixed.encode("utf-8"),
+                config_bytes,
             )
 
             # Fix localhost to 127.0.0.1 for Windows compatibility
-            config_yaml = config_yaml.replace("http://localhost:", "http://127.0.0.1:")
+            config_bytes = config_bytes.replace(
+                b"http://localhost:", b"http://127.0.0.1:"
+            )
 
             # Save to file
-            config_file = self.cloudflared_dir / "config.yml"
-            with open(config_file, "w") as f:
-                f.write(config_yaml)
+            _write_atomic(config_file, config_bytes)
+            _write_atomic(
+                cache_file,
+                f"{cache_key} {config_file.stat().st_mtime_ns}".encode("utf-8"),
+            )
 
             logger.info(f"Config saved: {config_file}")
+            self._config_ready = True
             return True
 
         except Exception as e:
@@ -226,9 +417,9 @@ class TunnelManager:
                     logger.error("Failed to download cloudflared")
                     return False
 
-            # Verify config.yml exists
+            # Verify config.yml exists (already known if this instance saved it)
             config_file = self.cloudflared_dir / "config.yml"
-            if not config_file.exists():
+            if not self._config_ready and not config_file.exists():
                 logger.error(f"config.yml not found at {config_file}")
                 return False
 
@@ -244,61 +435,76 @@ class TunnelManager:
 
             logger.info(f"Tunnel command: {' '.join(cmd)}")
 
-            # Start process (hide console window on Windows)
-            self.tunnel_process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                startupinfo=_get_subprocess_startupinfo(),
-                creationflags=_get_subprocess_creation_flags(),
-            )
+            self.ready_event.clear()
+            ready_event = self.ready_event
+
+            self._recent_output.clear()
+            log_file = None
+            if config.get_rpa_setting("tunnel.log_to_file", True):
+                # cloudflared writes straight to the file, so it can never
+                # block on a full pipe; a tail thread follows the file instead
+                log_file, log_offset = self._open_log_file()
+
+            # Start process (hide console window on Windows). cloudflared
+            # writes its regular log to stderr, so both streams share one
+            # destination. Only the std handles are inherited, and the child
+            # runs from its own directory rather than the agent's
+            try:
+                self.tunnel_process = subprocess.Popen(
+                    cmd,
+                    stdout=log_file if log_file is not None else subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    close_fds=True,
+                    cwd=str(self.cloudflared_dir),
+                    startupinfo=_get_subprocess_startupinfo(),
+                    creationflags=_get_subprocess_creation_flags(),
+                )
+            finally:
+                if log_file is not None:
+                    # The child holds its own handle
+                    log_file.close()
+
+            if log_file is not None:
+                monitor_thread = threading.Thread(
+                    target=self._tail_log_file,
+                    args=(
+                        self.cloudflared_dir / CLOUDFLARED_LOG_FILE,
+                        log_offset,
+                        self.tunnel_process,
+                        ready_event,
+                    ),
+                    daemon=True,
+                )
+            else:
+                monitor_thread = threading.Thread(
+                    target=self._monitor_output,
+                    args=(self.tunnel_process.stdout, ready_event),
+                    daemon=True,
+                )
 
             logger.info(f"Tunnel started (PID: {self.tunnel_process.pid})")
 
+            if _IS_WINDOWS:
+                self._job = _create_kill_job(self.tunnel_process.pid)
+                if self._job is None:
+                    logger.warning(
+                        f"Could not create job object (error {ctypes.get_last_error()}), "
+                        "stop will fall back to taskkill"
+                    )
+
             # Monitor tunnel output
-            import threading
-
-            def monitor_stdout():
-                try:
-                    for line in iter(self.tunnel_process.stdout.readline, b""):
-                        if line:
-                            decoded = line.decode("utf-8", errors="ignore").strip()
-                            if decoded:
-                                logger.info(f"[CLOUDFLARED] {decoded}")
-                                if (
-                                    "registered" in decoded.lower()
-                                    or "connected" in decoded.lower()
-                                ):
-                                    logger.info("Tunnel connected to Cloudflare")
-                except Exception as e:
-                    logger.error(f"Error reading stdout: {e}", exc_info=True)
-
-            def monitor_stderr():
-                try:
-                    for line in iter(self.tunnel_process.stderr.readline, b""):
-                        if line:
-                            decoded = line.decode("utf-8", errors="ignore").strip()
-                            if decoded:
-                                logger.warning(f"[CLOUDFLARED-ERR] {decoded}")
-                except Exception as e:
-                    logger.error(f"Error reading stderr: {e}", exc_info=True)
-
-            stdout_thread = threading.Thread(target=monitor_stdout, daemon=True)
-            stderr_thread = threading.Thread(target=monitor_stderr, daemon=True)
-            stdout_thread.start()
-            stderr_thread.start()
-
-            # Give it a moment to start
-            import time
-
-            time.sleep(0.5)
-
-            # Check if process is still alive
-            if self.tunnel_process.poll() is not None:
-                logger.error(
-                    f"Tunnel process died immediately (exit code: {self.tunnel_process.returncode})"
-                )
-                return False
+            monitor_thread.start()
+
+            # Give it up to STARTUP_CHECK_SECONDS to either register with
+            # Cloudflare or die, returning as soon as one of them happens
+            for _ in range(int(STARTUP_CHECK_SECONDS / STARTUP_POLL_INTERVAL)):
+                if ready_event.wait(STARTUP_POLL_INTERVAL):
+                    break
+                if self.tunnel_process.poll() is not None:
+                    logger.error(
+                        f"Tunnel process died immediately (exit code: {self.tunnel_process.returncode})"
+                    )
+                    return False
 
             return True
 
@@ -306,14 +512,124 @@ class TunnelManager:
             logger.error(f"Error starting tunnel: {e}", exc_info=True)
             return False
 
+    def _monitor_output(self, pipe, ready_event: threading.Event):
+        """
+        Log cloudflared output until the pipe closes.
+
+        Reads whatever is available (up to OUTPUT_READ_SIZE) per call and
+        splits it into lines here, instead of one readline() call per line.
+        """
+        fd = pipe.fileno()
+        pending = b""
+        try:
+            while True:
+                block = os.read(fd, OUTPUT_READ_SIZE)
+                if not block:
+                    break
+                lines = (pending + block).split(b"\n")
+                pending = lines.pop()  # Incomplete last line, if any
+                for line in lines:
+                    self._handle_output_line(line, ready_event)
+            if pending:
+                self._handle_output_line(pending, ready_event)
+        except Exception as e:
+            logger.error(f"Error reading cloudflared output: {e}", exc_info=True)
+
+    def _open_log_file(self):
+        """
+        Open the cloudflared log file for appending, rotating it first if it
+        has grown too large.
+
+        Returns:
+            (file object, offset where this run's output starts)
+        """
+        log_path = self.cloudflared_dir / CLOUDFLARED_LOG_FILE
+        try:
+            if log_path.stat().st_size > CLOUDFLARED_LOG_MAX_BYTES:
+                os.replace(log_path, log_path.with_name(CLOUDFLARED_LOG_FILE + ".1"))
+        except OSError:
+            pass  # Missing, or still held open by a previous cloudflared
+        log_file = open(log_path, "ab")
+        return log_file, log_file.tell()
+
+    def _tail_log_file(
+        self,
+        log_path: Path,
+        offset: int,
+        process: subprocess.Popen,
+        ready_event: threading.Event,
+    ):
+        """Log cloudflared output appended to log_path until the process exits."""
+        pending = b""
+        exited = False
+        try:
+            with open(log_path, "rb") as f:
+                f.seek(offset)
+                while True:
+                    block = f.read(OUTPUT_READ_SIZE)
+                    if not block:
+                        if exited:
+                            break  # Drained everything written before exit
+                        # Output written between the last read and the exit
+                        # (often the fatal error) is read on the next pass
+                        exited = process.poll() is not None
+                        if not exited:
+                            time.sleep(LOG_TAIL_INTERVAL)
+                        continue
+                    lines = (pending + block).split(b"\n")
+                    pending = lines.pop()  # Incomplete last line, if any
+                    for line in lines:
+                        self._handle_output_line(line, ready_event)
+            if pending:
+                self._handle_output_line(pending, ready_event)
+        except Exception as e:
+            logger.error(f"Error reading cloudflared log: {e}", exc_info=True)
+
+    def _handle_output_line(self, line: bytes, ready_event: threading.Event):
+        """Log one line of cloudflared output and watch for readiness."""
+        # Level and readiness checks run on the raw bytes; the line is only
+        # decoded once, for the log record
+        line = line.strip()
+        if not line:
+            return
+        decoded = line.decode("utf-8", errors="ignore")
+        self._recent_output.append(decoded)
+        if any(level in line for level in _CLOUDFLARED_ERROR_LEVELS):
+            logger.warning("[CLOUDFLARED-ERR] %s", decoded)
+        else:
+            # Lazy formatting: these run once per cloudflared line
+            logger.info("[CLOUDFLARED] %s", decoded)
+        if not ready_event.is_set() and TUNNEL_READY_MARKER in line.lower():
+            logger.info("Tunnel connected to Cloudflare")
+            ready_event.set()
+
+    def wait_ready(self, timeout: float = 10) -> bool:
+        """
+        Wait until the tunnel has registered a connection with Cloudflare.
+
+        Returns:
+            True once ready, False on timeout or if the process exits
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.ready_event.wait(0.1):
+                return True
+            if not self.is_tunnel_running():
+                return False
+        return self.ready_event.is_set()
+
     def stop_tunnel(self):
         """Stop Cloudflare tunnel"""
         if self.tunnel_process:
             try:
                 logger.info("Stopping tunnel...")
 
-                # On Windows, try to kill the process tree
-                if platform.system() == "Windows":
+                # On Windows, kill the process tree through its job object
+                if _IS_WINDOWS and self._job is not None:
+                    _kernel32.TerminateJobObject(self._job, 1)
+                    self.tunnel_process.wait(timeout=5)
+                    logger.info("Tunnel stopped")
+                elif _IS_WINDOWS:
                     try:
                         # Try to kill using taskkill (kills process tree)
                         subprocess.run(
@@ -348,9 +664,16 @@ class TunnelManager:
             except Exception as e:
                 logger.error(f"Error stopping tunnel: {e}")
             finally:
+                if self._job is not None:
+                    _kernel32.CloseHandle(self._job)
+                    self._job = None
                 self.tunnel_process = None
                 logger.info("Tunnel process cleared")
 
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
     def is_tunnel_running(self) -> bool:
         """Check if tunnel is running"""
         if self.tunnel_process is None:
@@ -358,15 +681,8 @@ class TunnelManager:
         return self.tunnel_process.poll() is None
 
     def get_tunnel_logs(self) -> str:
-        """Get tunnel logs"""
-        if self.tunnel_process and self.tunnel_process.stderr:
-            try:
-                return self.tunnel_process.stderr.read().decode(
-                    "utf-8", errors="ignore"
-                )
-            except Exception:
-                return ""
-        return ""
+        """Get the most recent tunnel log lines"""
+        return "\n".join(self._recent_output)
 
     def setup_tunnel_from_backend(
         self, backend_url: str, username: str, password: str
@@ -384,7 +700,7 @@ class TunnelManager:
         """
         try:
             # Call RPA config endpoint
-            response = requests.post(
+            response = self._get_session().post(
                 f"{backend_url}/doctors/rpa-config",
                 json={"username": username, "password": password},
                 timeout=30,